@@ -1,11 +1,44 @@
 
 
 def load_translator(cfg: dict):
+    translator = load_translate_backend(cfg)
+
+    if cfg.get('memory', {}).get('enabled', False):
+        from .translate.memory import TranslationMemoryTranslator
+        translator = TranslationMemoryTranslator(translator)
+        translator.init(cfg['memory'])
+
+    if cfg.get('skip', {}).get('enabled', False):
+        from .translate.skip import SkipClassifier
+        translator.skip = SkipClassifier(
+            cfg['skip'].get('min_letter_ratio', 0.5),
+            cfg['skip'].get('min_letters', 2),
+        )
+
+    return translator
+
+def load_translate_backend(cfg: dict):
     if cfg['type'] == 'openai':
         from .translate.openai_gpt import TranslateOpenAIGPT
         translator = TranslateOpenAIGPT()
         translator.init(cfg)
         return translator
+
+    if cfg['type'] == 'seq2seq':
+        from .translate.seq2seq import Seq2SeqTranslator
+        translator = Seq2SeqTranslator()
+        translator.init(cfg.get('seq2seq', {}))
+        return translator
+
+    if cfg['type'] in ('identity', 'pseudo', 'latency'):
+        from .translate.local import IdentityTranslator, PseudoTranslator, LatencyTranslator
+        translator = {
+            'identity': IdentityTranslator,
+            'pseudo': PseudoTranslator,
+            'latency': LatencyTranslator,
+        }[cfg['type']]()
+        translator.init(cfg.get(cfg['type'], {}))
+        return translator
     
     raise("unknown translator")
 
@@ -2,9 +2,8 @@ import cv2
 import numpy as np
 from tqdm import tqdm
 from pathlib import Path
-from pdf2image import convert_from_bytes, convert_from_path
 from .base import LayoutBase 
-from utils import LayoutAnalyzer
+from utils import LayoutAnalyzer, iter_pdf_pages
 
 class DiTLayout(LayoutBase):
     def init(self, cfg: dict):
@@ -15,19 +14,11 @@ class DiTLayout(LayoutBase):
         self.DPI = cfg['DPI'] if 'DPI' in cfg else 200
  
     def get_layout(self, pdf_path_or_bytes: str, p_from, p_to) -> str:
-        
-        if isinstance(pdf_path_or_bytes, Path):
-            pdf_images = convert_from_path(pdf_path_or_bytes, dpi=self.DPI)
-        else:
-            pdf_images = convert_from_bytes(pdf_path_or_bytes, dpi=self.DPI)
 
         data = []
         images = []
 
-        for i, image in tqdm(enumerate(pdf_images)):
-            if i < p_from: continue
-            if i > p_to and p_to != 0: break
-
+        for i, image in tqdm(iter_pdf_pages(pdf_path_or_bytes, self.DPI, p_from, p_to)):
             result = self.get_single_layout(image)
             images.append(image)
             data.append(result)
@@ -23,15 +23,16 @@ class OCRBase(ABC):
 
 
     @abstractmethod
-    def get_all_text(self, layout):
+    def get_all_text(self, layout, image=None):
         """
-        Translates a given string into another language.
+        Recognizes the text of the text blocks of a page.
 
         Parameters:
-        - text (str): The text to be translated.
+        - layout (list): Layout blocks of the page, text and line_cnt are set on them.
+        - image: The page image, lets engines detect text on the whole page at once.
 
         Returns:
-        - str: The translated text.
+        - list: The layout.
 
         This method needs to be implemented by subclasses.
         """
@@ -1,40 +1,104 @@
 import re
+import cv2
 import numpy as np
 from pathlib import Path
 from tqdm import tqdm
-from .base import OCRBase 
+from .base import OCRBase
 from utils import OCRModel
 
+TEXT_TYPES = ["text", "list", "title"]
+
+
+def assign_boxes(boxes, bboxes) -> np.ndarray:
+    """
+    Assigns detected line boxes to the layout blocks containing them.
+
+    A line belongs to every block its center lies in, so overlapping
+    blocks get the same lines as when each block is detected on its own.
+    All lines are matched against all blocks at once.
+
+    Parameters:
+    - boxes: line boxes, shape [N, 4, 2]
+    - bboxes: block bboxes (x1, y1, x2, y2), shape [M, 4]
+
+    Returns:
+    - np.ndarray: [N, M] mask, True where line n lies in block m
+    """
+    if len(boxes) == 0 or len(bboxes) == 0:
+        return np.zeros((len(boxes), len(bboxes)), dtype=bool)
+    centers = np.asarray(boxes, dtype=np.float32).mean(axis=1)
+    x1, y1, x2, y2 = np.asarray(bboxes, dtype=np.float32).T
+    cx, cy = centers[:, 0:1], centers[:, 1:2]
+    return (cx >= x1) & (cx <= x2) & (cy >= y1) & (cy <= y2)
+
+
 class PaddleOCR(OCRBase):
     def init(self, cfg: dict):
         self.ocr_model = OCRModel(
-            model_root_dir= Path("models/paddle-ocr"), device=cfg['device']
+            model_root_dir= Path("models/paddle-ocr"),
+            device=cfg['device'],
+            page_det_limit_side_len=cfg.get('page_det_limit_side_len', 2560),
+            rec_batch_num=cfg.get('rec_batch_num', 32),
+            rec_bucket_ratio=cfg.get('rec_bucket_ratio', 1.5),
+            onnxruntime=cfg.get('onnxruntime', {}),
+        )
+        # detect text once on the whole page instead of once per block
+        self.page_level = cfg.get('page_level', False)
+
+    def get_all_text(self, layout, image=None) -> str:
+        if self.page_level and image is not None:
+            return self.get_all_text_page(layout, image)
+
+        blocks = [line for line in layout if line.type in TEXT_TYPES]
+        detections = [self.ocr_model.detect(line.image) for line in tqdm(blocks)]
+
+        # the lines of all blocks are recognized together, in batches of similar width
+        rec_res = self.ocr_model.recognize_many(
+            [(line.image, boxes) for line, (boxes, _) in zip(blocks, detections)]
         )
- 
-    def get_all_text(self, layout) -> str:
+        for line, (_, line_ids), line_res in zip(blocks, detections, rec_res):
+            kept = [i for i, rec_result in enumerate(line_res) if rec_result[1] >= self.ocr_model.drop_score]
+            self.set_text(line, [line_res[i] for i in kept], line_ids[kept])
+
+        return layout
+
+    def get_all_text_page(self, layout, image):
+        blocks = [line for line in layout if line.type in TEXT_TYPES]
+        if not blocks:
+            return layout
 
-        for i, line in tqdm(enumerate(layout)):
-            if line.type in ["text", "list", "title"]:
-                # update this so image is created from images and layout bbox info
-                image = line.image
-                ocr_results = self.get_text(image)
-                text = list(map(lambda x: x[0],ocr_results[1]))
-                text = " ".join(text)
-                clean_text = re.sub(r"\n|\t", " ", text)
-                line.text = clean_text
+        # the block images are cropped from the BGR page the layout model saw
+        page = cv2.cvtColor(np.array(image, dtype=np.uint8), cv2.COLOR_RGB2BGR)
+        boxes, _ = self.ocr_model.detect_page(page)
+        inside = assign_boxes(boxes, [line.bbox for line in blocks])
 
-                lasty = 0
-                cnt = 0
-                for x in ocr_results[0]:
-                    if x[0][1] > lasty:
-                        cnt+=1
-                        lasty = x[2][1]
+        # every line is recognized once, even if it lies in several blocks
+        keep = np.flatnonzero(inside.any(axis=1))
+        rec_res = self.ocr_model.recognize(page, [boxes[i] for i in keep])
 
-                line.line_cnt = cnt
+        block_boxes = [[] for _ in blocks]
+        block_res = [[] for _ in blocks]
+        for i, rec_result in zip(keep, rec_res):
+            if rec_result[1] >= self.ocr_model.drop_score:
+                for j in np.flatnonzero(inside[i]):
+                    block_boxes[j].append(boxes[i])
+                    block_res[j].append(rec_result)
 
+        # lines of neighbouring columns can line up on the page, so the
+        # lines are grouped again within every block
+        for line, line_boxes, line_res in zip(blocks, block_boxes, block_res):
+            order, line_ids = self.ocr_model.group_lines(line_boxes)
+            self.set_text(line, [line_res[i] for i in order], line_ids)
 
         return layout
-    
+
+    def set_text(self, line, rec_res, line_ids):
+        text = list(map(lambda x: x[0], rec_res))
+        text = " ".join(text)
+        clean_text = re.sub(r"\n|\t", " ", text)
+        line.text = clean_text
+        # the font engine divides the block height by it
+        line.line_cnt = max(1, len(np.unique(line_ids)))
+
     def get_text(self, image):
         return self.ocr_model(image)
-                
\ No newline at end of file
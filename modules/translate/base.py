@@ -1,6 +1,45 @@
+import asyncio
 from abc import ABC, abstractmethod
 
+from .scheduler import run_coroutine
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def pack_batches(texts: list, token_budget: int) -> list:
+    """
+    Splits texts into consecutive batches of at most token_budget tokens.
+
+    A text larger than the budget gets a batch of its own.
+    """
+    batches, batch, tokens = [], [], 0
+    for text in texts:
+        cost = estimate_tokens(text)
+        if batch and tokens + cost > token_budget:
+            batches.append(batch)
+            batch, tokens = [], 0
+        batch.append(text)
+        tokens += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 class TranslateBase(ABC):
+    # backends that can translate many texts in one request set this
+    # and implement translate_batch
+    supports_batch = False
+    batch_token_budget = 2000
+    # a RateLimiter makes translate_texts send its requests concurrently
+    # through atranslate / atranslate_batch
+    limiter = None
+    # a SkipClassifier lets translate_all pass blocks like page numbers,
+    # formulas and URLs through without calling the translator
+    skip = None
+
     @abstractmethod
     def init(self, cfg: dict):
         pass
@@ -9,13 +48,129 @@ class TranslateBase(ABC):
     def get_languages(self):
         pass
 
+    def version(self) -> str:
+        """
+        Identifies the model and prompt used, so cached translations are
+        not reused across them.
+        """
+        return type(self).__name__
+
+    def stats(self) -> dict:
+        """
+        Returns counters collected by the translator (e.g. cache hits).
+        """
+        stats = self.limiter.stats() if self.limiter is not None else {}
+        if self.skip is not None:
+            stats.update(self.skip.stats())
+        return stats
+
+    def translatable_lines(self, layout, from_lang, to_lang) -> list:
+        """
+        Returns the lines of a layout that need translating; lines the
+        skip classifier rejects get their text as translation.
+        """
+        lines = [line for line in layout if line.text]
+        if self.skip is None:
+            return lines
+
+        translatable = []
+        for line in lines:
+            if self.skip.check(line.text, from_lang, to_lang):
+                translatable.append(line)
+            else:
+                line.translated_text = line.text
+        return translatable
+
     def translate_all(self, layout, from_lang, to_lang):
-        for line in layout:
-            if line.text:
-                line.translated_text = self.translate(line.text, from_lang, to_lang)
+        lines = self.translatable_lines(layout, from_lang, to_lang)
+        translated = self.translate_texts([line.text for line in lines], from_lang, to_lang)
+        for line, translated_text in zip(lines, translated):
+            line.translated_text = translated_text
 
         return layout
 
+    def translate_texts(self, texts: list, from_lang, to_lang) -> list:
+        """
+        Translates a list of texts, packing them into batched requests
+        when the backend supports it.
+
+        Returns the translations in the order of texts.
+        """
+        if self.limiter is not None:
+            return run_coroutine(self.atranslate_texts(texts, from_lang, to_lang))
+
+        if not self.supports_batch:
+            return [self.translate(text, from_lang, to_lang) for text in texts]
+
+        translated = []
+        for batch in pack_batches(texts, self.batch_token_budget):
+            if len(batch) == 1:
+                translated.append(self.translate(batch[0], from_lang, to_lang))
+            else:
+                translated.extend(self.translate_batch(batch, from_lang, to_lang))
+        return translated
+
+    def translate_batch(self, texts: list, from_lang, to_lang) -> list:
+        """
+        Translates several texts in a single request.
+
+        Only called when supports_batch is set.
+        """
+        raise NotImplementedError
+
+    async def atranslate_texts(self, texts: list, from_lang, to_lang) -> list:
+        """
+        Async translate_texts: all batches are sent at once and the limiter
+        bounds how many are in flight.
+        """
+        if self.supports_batch:
+            batches = pack_batches(texts, self.batch_token_budget)
+        else:
+            batches = [[text] for text in texts]
+
+        results = await asyncio.gather(*[
+            self._atranslate_limited(batch, from_lang, to_lang) for batch in batches
+        ])
+        return [translated_text for result in results for translated_text in result]
+
+    async def _atranslate_limited(self, batch: list, from_lang, to_lang) -> list:
+        # input and output are about the same size
+        cost = 2 * sum(estimate_tokens(text) for text in batch)
+        async with self.limiter.request(cost):
+            if len(batch) == 1:
+                return [await self.atranslate(batch[0], from_lang, to_lang)]
+            translated = await self.atranslate_batch_partial(batch, from_lang, to_lang)
+
+        # texts missing from the batch answer are requests of their own, sent
+        # once the batch has given back its slot
+        missing = [i for i, translated_text in enumerate(translated) if translated_text is None]
+        retried = await asyncio.gather(*[
+            self._atranslate_limited([batch[i]], from_lang, to_lang) for i in missing
+        ])
+        for i, result in zip(missing, retried):
+            translated[i] = result[0]
+        return translated
+
+    async def atranslate(self, text: str, from_lang, to_lang) -> str:
+        """
+        Async translate, by default runs translate in a thread.
+        """
+        return await asyncio.to_thread(self.translate, text, from_lang, to_lang)
+
+    async def atranslate_batch(self, texts: list, from_lang, to_lang) -> list:
+        """
+        Async translate_batch, by default runs translate_batch in a thread.
+        """
+        return await asyncio.to_thread(self.translate_batch, texts, from_lang, to_lang)
+
+    async def atranslate_batch_partial(self, texts: list, from_lang, to_lang) -> list:
+        """
+        A single batched request. Texts the backend did not translate are
+        None and are requested one by one through the limiter; by default
+        nothing is missing.
+        """
+        return await self.atranslate_batch(texts, from_lang, to_lang)
+
     @abstractmethod
     def translate(self, text: str) -> str:
         """
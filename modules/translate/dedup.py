@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import Future
+
+from .base import TranslateBase
+from .fuzzy import mask_numbers, patch_numbers
+from .memory import normalize
+
+
+class DocumentDeduper:
+    """Translates each repeated block of a document only once.
+
+    Running headers, footers and other page furniture repeat on every
+    page. Blocks are grouped by their whitespace-normalized text with
+    numbers masked, so "Page 3" and "Page 4" fall into one group: the
+    first occurrence is translated and the others reuse its translation
+    with their own numbers patched in. Pages may be translated from
+    several threads; a block waits for a translation that another page
+    has already started.
+
+    Masking numbers goes beyond identical text: any blocks that differ
+    only in their numbers share a translation, e.g. "Total: 12 items" and
+    "Total: 15 items", or two table rows of figures. Blocks whose numbers
+    cannot be patched into the translation are translated on their own.
+
+    Parameters
+    ----------
+    translator: TranslateBase
+        Translator used for the first occurrence of every group
+    from_lang, to_lang: str
+        Languages of the document
+    """
+
+    def __init__(self, translator: TranslateBase, from_lang, to_lang) -> None:
+        self.translator = translator
+        self.from_lang = from_lang
+        self.to_lang = to_lang
+        # template -> (numbers of the first occurrence, future of its translation)
+        self._groups = {}
+        self._lock = threading.Lock()
+        self.blocks = 0
+        self.calls = 0
+
+    def translate_all(self, layout, from_lang=None, to_lang=None):
+        # same call as TranslateBase.translate_all, the languages are fixed per document
+        lines = self.translator.translatable_lines(layout, self.from_lang, self.to_lang)
+        masked = [mask_numbers(normalize(line.text)) for line in lines]
+
+        own = []
+        with self._lock:
+            self.blocks += len(lines)
+            groups = []
+            for i, (template, numbers) in enumerate(masked):
+                if template not in self._groups:
+                    self._groups[template] = (numbers, Future())
+                    own.append(i)
+                groups.append(self._groups[template])
+
+        # translate the groups started by this page before waiting for others,
+        # so two pages never wait for each other
+        self.__translate([lines[i].text for i in own], [groups[i][1] for i in own])
+
+        retry = []
+        for i, (line, (_, numbers), (group_numbers, future)) in enumerate(zip(lines, masked, groups)):
+            translated_text = future.result()
+            if numbers != group_numbers:
+                translated_text = patch_numbers(translated_text, group_numbers, numbers)
+            if translated_text is None:
+                # the numbers could not be mapped, translate this block by itself
+                retry.append(i)
+            line.translated_text = translated_text
+
+        if retry:
+            futures = [Future() for _ in retry]
+            self.__translate([lines[i].text for i in retry], futures)
+            for i, future in zip(retry, futures):
+                lines[i].translated_text = future.result()
+
+        return layout
+
+    def __translate(self, texts: list, futures: list) -> None:
+        if not texts:
+            return
+        with self._lock:
+            self.calls += len(texts)
+        try:
+            translated = self.translator.translate_texts(texts, self.from_lang, self.to_lang)
+        except Exception as e:
+            # pages waiting for these groups fail as well
+            for future in futures:
+                future.set_exception(e)
+            raise
+        for future, translated_text in zip(futures, translated):
+            future.set_result(translated_text)
+
+    def stats(self) -> dict:
+        return {
+            "blocks": self.blocks,
+            "unique_blocks": len(self._groups),
+            "translator_calls_saved": self.blocks - self.calls,
+        }
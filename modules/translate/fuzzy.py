@@ -0,0 +1,191 @@
+import difflib
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .memory import TranslationMemory, normalize
+
+NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+# hashes are taken modulo a prime just above 2**32; multipliers stay below
+# 2**32 so (a * x + b) never overflows uint64
+_PRIME = np.uint64(4294967311)
+
+
+def mask_numbers(text: str) -> Tuple[str, List[str]]:
+    """Replace every number by '#', return the template and the numbers."""
+    return NUMBER_RE.sub("#", text), NUMBER_RE.findall(text)
+
+
+def patch_numbers(translation: str, old_numbers: List[str], new_numbers: List[str]) -> Optional[str]:
+    """Swap the numbers of a stored translation for the numbers of a new source.
+
+    Returns None when the numbers cannot be mapped unambiguously, e.g. the
+    translation reformatted a number or the same number maps to two others.
+    """
+    if len(old_numbers) != len(new_numbers):
+        return None
+    mapping = {}
+    for old, new in zip(old_numbers, new_numbers):
+        if mapping.setdefault(old, new) != new:
+            return None
+    if any(number not in mapping for number in NUMBER_RE.findall(translation)):
+        return None
+    return NUMBER_RE.sub(lambda m: mapping[m.group(0)], translation)
+
+
+class FuzzyIndex:
+    """MinHash/LSH index over character n-grams for near-duplicate lookups.
+
+    Parameters
+    ----------
+    num_perm: int
+        Number of MinHash permutations
+    bands: int
+        Number of LSH bands, num_perm must be divisible by it. More bands
+        find less similar candidates.
+    ngram: int
+        Length of the character shingles
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, ngram: int = 3, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2**32 - 1, num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, 2**32 - 1, num_perm, dtype=np.int64).astype(np.uint64)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self._buckets = defaultdict(set)
+        # key -> (signature, payload, band keys)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def signature(self, text: str) -> np.ndarray:
+        n = self.ngram
+        shingles = {text[i : i + n] for i in range(max(1, len(text) - n + 1))}
+        x = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        return ((np.outer(x, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def _band_keys(self, scope: str, signature: np.ndarray) -> List[tuple]:
+        r = self.rows
+        return [(scope, i, signature[i * r : (i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    def add(self, key: str, scope: str, text: str, payload) -> None:
+        """Index text under key, replacing an earlier entry with the same key."""
+        signature = self.signature(text)
+        band_keys = self._band_keys(scope, signature)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (signature, payload, band_keys)
+            for band_key in band_keys:
+                self._buckets[band_key].add(key)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band_key in entry[2]:
+            bucket = self._buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band_key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def query(self, scope: str, text: str, limit: int = 5) -> list:
+        """Return up to limit payloads of likely near-duplicates, best first."""
+        signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(scope, signature):
+                candidates.update(self._buckets.get(band_key, ()))
+            scored = [
+                (float(np.mean(self._entries[i][0] == signature)), self._entries[i][1])
+                for i in candidates
+            ]
+        scored.sort(key=lambda s: s[0], reverse=True)
+        return [payload for _, payload in scored[:limit]]
+
+
+class FuzzyMatcher:
+    """Reuses stored translations of near-identical source texts.
+
+    Texts are compared with numbers masked out. A candidate that differs
+    only in numbers and whitespace gets its numbers patched; a candidate
+    whose similarity reaches reuse_threshold (OCR noise, punctuation) is
+    reused as it is. Everything else falls back to the translator.
+
+    Parameters
+    ----------
+    reuse_threshold: float
+        Minimum similarity (0-1) for reusing a translation unchanged
+    num_perm: int
+        Number of MinHash permutations of the index
+    bands: int
+        Number of LSH bands of the index
+    """
+
+    def __init__(self, reuse_threshold: float = 0.95, num_perm: int = 64, bands: int = 16) -> None:
+        self.reuse_threshold = reuse_threshold
+        self.index = FuzzyIndex(num_perm, bands)
+        self.patched = 0
+        self.reused = 0
+
+    @staticmethod
+    def _scope(from_lang: str, to_lang: str, version: str) -> str:
+        return "\x00".join([from_lang.lower(), to_lang.lower(), version])
+
+    def add(self, text: str, translation: str, from_lang: str, to_lang: str, version: str) -> None:
+        template, numbers = mask_numbers(normalize(text))
+        # same key as the memory entry, so evicting it removes it here too
+        self.index.add(
+            TranslationMemory.key(text, from_lang, to_lang, version),
+            self._scope(from_lang, to_lang, version),
+            template.lower(),
+            (template, numbers, translation),
+        )
+
+    def add_many(self, entries: Iterable[tuple]) -> None:
+        for entry in entries:
+            self.add(*entry)
+
+    def remove_many(self, keys: Iterable[str]) -> None:
+        """Drop the entries of the given TranslationMemory keys."""
+        for key in keys:
+            self.index.remove(key)
+
+    def lookup(self, text: str, from_lang: str, to_lang: str, version: str) -> Optional[str]:
+        template, numbers = mask_numbers(normalize(text))
+        candidates = self.index.query(self._scope(from_lang, to_lang, version), template.lower())
+        for candidate_template, candidate_numbers, translation in candidates:
+            if candidate_template == template:
+                patched = patch_numbers(translation, candidate_numbers, numbers)
+                if patched is not None:
+                    self.patched += 1
+                    return patched
+                continue
+
+            similarity = difflib.SequenceMatcher(
+                None, candidate_template.lower(), template.lower()
+            ).ratio()
+            if similarity >= self.reuse_threshold and candidate_numbers == numbers:
+                self.reused += 1
+                return translation
+        return None
+
+    def stats(self) -> dict:
+        return {"fuzzy_patched": self.patched, "fuzzy_reused": self.reused}
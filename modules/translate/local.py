@@ -0,0 +1,144 @@
+import asyncio
+import math
+import random
+import threading
+import time
+
+from .base import TranslateBase, estimate_tokens
+from .scheduler import get_rate_limiter
+
+langs = [
+    "Chinese",
+    "Croatian",
+    "Dutch",
+    "English",
+    "French",
+    "German",
+    "Italian",
+    "Japanese",
+    "Portuguese",
+    "Russian",
+    "Slovenian",
+    "Spanish",
+]
+
+
+class IdentityTranslator(TranslateBase):
+    """Returns every text unchanged, for benchmarking without a translator."""
+
+    def init(self, cfg: dict):
+        pass
+
+    def get_languages(self):
+        return langs
+
+    def translate(self, text: str, from_lang='ENGLISH', to_lang='SLOVENIAN') -> str:
+        return text
+
+
+class PseudoTranslator(TranslateBase):
+    """Deterministic pseudo-translation that makes text longer.
+
+    Words are wrapped in brackets and padded by repeating their letters,
+    so the result is `expansion` times as long as the source, like most
+    translations from English. Useful to exercise font fitting and
+    rendering without a translator.
+
+    config options:
+    - expansion: length factor of the output (default 1.3)
+    """
+
+    def init(self, cfg: dict):
+        self.expansion = cfg.get('expansion', 1.3)
+
+    def get_languages(self):
+        return langs
+
+    def version(self) -> str:
+        return 'pseudo:%s' % self.expansion
+
+    def translate(self, text: str, from_lang='ENGLISH', to_lang='SLOVENIAN') -> str:
+        target = int(len(text) * self.expansion)
+        words = text.split()
+        if not words:
+            return text
+        padding = max(0, target - len(text) - 2)
+        per_word, extra = divmod(padding, len(words))
+        out = []
+        for i, word in enumerate(words):
+            pad = per_word + (1 if i < extra else 0)
+            out.append(word + (word[-1] * pad if pad else ''))
+        return '[' + ' '.join(out) + ']'
+
+
+class LatencyTranslator(PseudoTranslator):
+    """Pseudo-translation that takes as long as a remote translator.
+
+    Every request sleeps for a delay drawn from a seeded distribution, so
+    the scheduling, batching and rate limiting can be benchmarked
+    reproducibly without network access.
+
+    config options:
+    - expansion: length factor of the output (default 1.0)
+    - delay: 'constant', 'uniform', 'exponential' or 'lognormal' (default 'lognormal')
+    - delay_mean: mean delay of a request in seconds (default 0.5)
+    - delay_spread: width of 'uniform', sigma of 'lognormal' (default 0.5)
+    - per_token_delay: additional seconds per estimated token (default 0)
+    - seed: seed of the delay generator (default 0)
+    - batch_token_budget: batch size, 0 disables batching (default 2000)
+    - max_concurrency: requests in flight, 1 = sequential (default 8)
+    """
+
+    def init(self, cfg: dict):
+        self.expansion = cfg.get('expansion', 1.0)
+        self.delay = cfg.get('delay', 'lognormal')
+        self.delay_mean = cfg.get('delay_mean', 0.5)
+        self.delay_spread = cfg.get('delay_spread', 0.5)
+        self.per_token_delay = cfg.get('per_token_delay', 0)
+        self.rng = random.Random(cfg.get('seed', 0))
+        self.rng_lock = threading.Lock()
+        self.batch_token_budget = cfg.get('batch_token_budget', self.batch_token_budget)
+        self.supports_batch = self.batch_token_budget > 0
+        if cfg.get('max_concurrency', 8) > 1:
+            self.limiter = get_rate_limiter(
+                'latency',
+                cfg.get('max_concurrency', 8),
+                cfg.get('requests_per_minute', 0),
+                cfg.get('tokens_per_minute', 0),
+            )
+
+    def version(self) -> str:
+        return 'latency:%s' % self.expansion
+
+    def sample_delay(self, texts: list) -> float:
+        with self.rng_lock:
+            if self.delay == 'constant':
+                delay = self.delay_mean
+            elif self.delay == 'uniform':
+                delay = self.rng.uniform(self.delay_mean - self.delay_spread, self.delay_mean + self.delay_spread)
+            elif self.delay == 'exponential':
+                delay = self.rng.expovariate(1 / self.delay_mean)
+            elif self.delay == 'lognormal':
+                # mu chosen so the mean of the distribution is delay_mean
+                sigma = self.delay_spread
+                delay = self.rng.lognormvariate(math.log(self.delay_mean) - sigma ** 2 / 2, sigma)
+            else:
+                raise ValueError("unknown delay distribution: %s" % self.delay)
+        tokens = sum(estimate_tokens(text) for text in texts)
+        return max(0.0, delay) + self.per_token_delay * tokens
+
+    def translate(self, text: str, from_lang='ENGLISH', to_lang='SLOVENIAN') -> str:
+        time.sleep(self.sample_delay([text]))
+        return PseudoTranslator.translate(self, text)
+
+    def translate_batch(self, texts: list, from_lang='ENGLISH', to_lang='SLOVENIAN') -> list:
+        time.sleep(self.sample_delay(texts))
+        return [PseudoTranslator.translate(self, text) for text in texts]
+
+    async def atranslate(self, text: str, from_lang='ENGLISH', to_lang='SLOVENIAN') -> str:
+        await asyncio.sleep(self.sample_delay([text]))
+        return PseudoTranslator.translate(self, text)
+
+    async def atranslate_batch(self, texts: list, from_lang='ENGLISH', to_lang='SLOVENIAN') -> list:
+        await asyncio.sleep(self.sample_delay(texts))
+        return [PseudoTranslator.translate(self, text) for text in texts]
@@ -0,0 +1,282 @@
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from .base import TranslateBase
+
+
+def normalize(text: str) -> str:
+    """Normalize source text for lookups: collapse and strip whitespace."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class TranslationMemory:
+    """SQLite store of past translations with LRU eviction.
+
+    Entries are keyed on the normalized source text, the language pair
+    and the translator version (model and prompt), so changing the model
+    or the prompt never serves stale translations.
+
+    Parameters
+    ----------
+    path: str
+        Path to the SQLite database
+    max_entries: int
+        Number of entries above which the least recently used ones are removed
+    on_evict: Optional[Callable[[list], None]]
+        Called with the keys of evicted entries, e.g. to drop them from a
+        FuzzyMatcher
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, on_evict: Optional[Callable[[list], None]] = None) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS memory ("
+                " key TEXT PRIMARY KEY, source TEXT, translation TEXT,"
+                " from_lang TEXT, to_lang TEXT, version TEXT,"
+                " last_used REAL, hits INTEGER DEFAULT 0)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS memory_last_used ON memory (last_used)"
+            )
+
+    @staticmethod
+    def key(text: str, from_lang: str, to_lang: str, version: str) -> str:
+        parts = [normalize(text), from_lang.lower(), to_lang.lower(), version]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, text: str, from_lang: str, to_lang: str, version: str) -> Optional[str]:
+        key = self.key(text, from_lang, to_lang, version)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM memory WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE memory SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                    (time.time(), key),
+                )
+        return row[0]
+
+    def put(self, text: str, translation: str, from_lang: str, to_lang: str, version: str) -> None:
+        self.put_many([(text, translation, from_lang, to_lang, version)])
+
+    def put_many(self, entries: list) -> None:
+        """Store (text, translation, from_lang, to_lang, version) tuples."""
+        now = time.time()
+        rows = [
+            (self.key(text, from_lang, to_lang, version), normalize(text), translation,
+             from_lang, to_lang, version, now)
+            for text, translation, from_lang, to_lang, version in entries
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO memory"
+                " (key, source, translation, from_lang, to_lang, version, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            evicted = self._evict()
+        if evicted and self.on_evict is not None:
+            self.on_evict(evicted)
+
+    def _evict(self) -> list:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()
+        if count <= self.max_entries:
+            return []
+        keys = [
+            key for (key,) in self._conn.execute(
+                "SELECT key FROM memory ORDER BY last_used LIMIT ?", (count - self.max_entries,)
+            )
+        ]
+        self._conn.executemany("DELETE FROM memory WHERE key = ?", [(key,) for key in keys])
+        return keys
+
+    def rows(self) -> list:
+        """Return all (source, translation, from_lang, to_lang, version) entries."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT source, translation, from_lang, to_lang, version FROM memory"
+            ).fetchall()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def export(self, path: str) -> int:
+        """Write all entries to a JSON lines file, return the number written."""
+        rows = self.rows()
+        with open(path, "w", encoding="utf-8") as f:
+            for source, translation, from_lang, to_lang, version in rows:
+                f.write(json.dumps({
+                    "source": source, "translation": translation,
+                    "from_lang": from_lang, "to_lang": to_lang, "version": version,
+                }, ensure_ascii=False) + "\n")
+        return len(rows)
+
+    def preload(self, path: str, version: Optional[str] = None) -> int:
+        """Load entries from a JSON lines file written by export().
+
+        If version is given it overrides the version of every entry,
+        e.g. to reuse reviewed translations with a new model.
+        """
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                e = json.loads(line)
+                entries.append((
+                    e["source"], e["translation"], e["from_lang"], e["to_lang"],
+                    version or e["version"],
+                ))
+        self.put_many(entries)
+        return len(entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "memory_hits": self.hits,
+            "memory_misses": self.misses,
+            "memory_hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class TranslationMemoryTranslator(TranslateBase):
+    """Wraps any TranslateBase and answers repeated texts from a TranslationMemory.
+
+    With `fuzzy` enabled, texts that differ from a stored one only in
+    numbers, whitespace or OCR noise are answered by a FuzzyMatcher.
+
+    Parameters
+    ----------
+    translator: TranslateBase
+        Initialized translator called on memory misses
+    """
+
+    def __init__(self, translator: TranslateBase) -> None:
+        self.translator = translator
+        self.lookups = 0
+        self.backend_calls = 0
+        # translate_texts runs in several translate workers at once
+        self._lock = threading.Lock()
+
+    def init(self, cfg: dict):
+        self.memory = TranslationMemory(
+            cfg.get('path', 'temp/cache/translation_memory.sqlite'),
+            cfg.get('max_entries', 100000),
+        )
+
+        self.fuzzy = None
+        fuzzy_cfg = cfg.get('fuzzy', {})
+        if fuzzy_cfg.get('enabled', False):
+            from .fuzzy import FuzzyMatcher
+            self.fuzzy = FuzzyMatcher(
+                fuzzy_cfg.get('reuse_threshold', 0.95),
+                fuzzy_cfg.get('num_perm', 64),
+                fuzzy_cfg.get('bands', 16),
+            )
+            self.fuzzy.add_many(self.memory.rows())
+            self.memory.on_evict = self.fuzzy.remove_many
+
+    def get_languages(self):
+        return self.translator.get_languages()
+
+    def version(self) -> str:
+        return self.translator.version()
+
+    def translate(self, text: str, from_lang='ENGLISH', to_lang='SLOVENIAN') -> str:
+        return self.translate_texts([text], from_lang, to_lang)[0]
+
+    def translate_texts(self, texts: list, from_lang, to_lang) -> list:
+        """
+        Answers texts from the memory and sends only the misses to the
+        wrapped translator, in one translate_texts call so it can batch them.
+        """
+        version = self.version()
+        with self._lock:
+            self.lookups += len(texts)
+        translated = [self.memory.get(text, from_lang, to_lang, version) for text in texts]
+        new = [i for i, translated_text in enumerate(translated) if translated_text is None]
+
+        if self.fuzzy is not None:
+            for i in new:
+                translated[i] = self.fuzzy.lookup(texts[i], from_lang, to_lang, version)
+
+        # identical misses are sent to the backend only once
+        misses = {}
+        for i in new:
+            if translated[i] is None:
+                misses.setdefault(normalize(texts[i]), []).append(i)
+        if misses:
+            sources = [texts[indices[0]] for indices in misses.values()]
+            with self._lock:
+                self.backend_calls += len(sources)
+            backend_translations = self.translator.translate_texts(sources, from_lang, to_lang)
+            for indices, translated_text in zip(misses.values(), backend_translations):
+                for i in indices:
+                    translated[i] = translated_text
+
+        # only backend translations are stored: a stored fuzzy match would
+        # turn into an exact hit and be patched again from there
+        entries = [
+            (texts[indices[0]], translated[indices[0]], from_lang, to_lang, version)
+            for indices in misses.values()
+        ]
+        if self.fuzzy is not None:
+            self.fuzzy.add_many(entries)
+        self.memory.put_many(entries)
+        return translated
+
+    def stats(self) -> dict:
+        stats = {**super().stats(), **self.translator.stats(), **self.memory.stats()}
+        if self.fuzzy is not None:
+            stats.update(self.fuzzy.stats())
+        with self._lock:
+            lookups, backend_calls = self.lookups, self.backend_calls
+        stats["calls_avoided"] = 1 - backend_calls / lookups if lookups else 0.0
+        return stats
+
+
+if __name__ == "__main__":
+    # run as a module from the repository root: python -m modules.translate.memory
+    parser = argparse.ArgumentParser(
+        prog="python -m modules.translate.memory",
+        description="Export or preload a translation memory.",
+    )
+    parser.add_argument("command", choices=["export", "preload"])
+    parser.add_argument("file", help="JSON lines file to write or read")
+    parser.add_argument(
+        "--db",
+        default="temp/cache/translation_memory.sqlite",
+        help="Path to the translation memory database.",
+    )
+    parser.add_argument(
+        "--version",
+        default=None,
+        help="Translator version to store preloaded entries under (default: as in the file).",
+    )
+    args = parser.parse_args()
+
+    memory = TranslationMemory(args.db)
+    if args.command == "export":
+        print(f"exported {memory.export(args.file)} entries")
+    else:
+        print(f"preloaded {memory.preload(args.file, args.version)} entries")
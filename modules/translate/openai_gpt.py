@@ -1,11 +1,26 @@
+import asyncio
+import hashlib
+import re
 from .base import TranslateBase 
-from openai import OpenAI
+from .resilience import get_resilient_caller
+from .scheduler import get_rate_limiter, run_coroutine
+from openai import APIStatusError, AsyncOpenAI
+
+SEGMENT_RE = re.compile(r'<seg id="(\d+)">(.*?)</seg>', re.S)
 
 def system_prompt(from_lang, to_lang):
     p  = "You are an %s-to-%s translator. " % (from_lang, to_lang)
     p += "Keep all special characters and HTML tags as in the source text. Return only %s translation." % to_lang
     return p
 
+def batch_system_prompt(from_lang, to_lang):
+    p  = "You are an %s-to-%s translator. " % (from_lang, to_lang)
+    p += 'The text consists of segments, each wrapped in <seg id="N">...</seg>. '
+    p += "Translate the content of every segment and return all segments in the same order, "
+    p += "each wrapped in its original <seg> tag with the same id. "
+    p += "Keep all special characters and HTML tags as in the source text. Return only the %s segments." % to_lang
+    return p
+
 langs = [
     "Albanian",
     "Arabic",
@@ -94,22 +109,110 @@ langs = [
     "Wu"
 ]
 
+def batch_messages(texts, from_lang, to_lang):
+    segments = "\n".join('<seg id="%d">%s</seg>' % (i, text) for i, text in enumerate(texts))
+    return [
+        { 'role': 'system', 'content': batch_system_prompt(from_lang, to_lang) },
+        { 'role': 'user', 'content': segments },
+    ]
+
+def parse_segments(content, count):
+    translated = {}
+    conflicting = set()
+    for seg_id, translated_text in SEGMENT_RE.findall(content or ''):
+        seg_id, translated_text = int(seg_id), translated_text.strip()
+        # a body with a <seg tag in it ran into the next segment because a
+        # </seg> was dropped; both are left out and requested again
+        if '<seg' in translated_text:
+            continue
+        if seg_id >= count or not translated_text:
+            continue
+        # an id answered twice with different texts is requested again
+        if translated.setdefault(seg_id, translated_text) != translated_text:
+            conflicting.add(seg_id)
+    for seg_id in conflicting:
+        del translated[seg_id]
+    return translated
+
+def is_retryable(e):
+    # connection errors and timeouts are retried, of the HTTP errors only
+    # rate limits, conflicts and server errors
+    if isinstance(e, APIStatusError):
+        return e.status_code in (408, 409, 429) or e.status_code >= 500
+    return True
+
 class TranslateOpenAIGPT(TranslateBase):
+    supports_batch = True
+
     def init(self, cfg: dict):
-        self.client = OpenAI(api_key=cfg['openai_api_key'])
+        resilience_cfg = cfg.get('resilience', {})
+        # retries and timeouts are handled by self.caller; the client keeps
+        # its connection pool on the shared translator loop
+        self.client = AsyncOpenAI(
+            api_key=cfg['openai_api_key'],
+            base_url=cfg.get('base_url'),
+            timeout=resilience_cfg.get('timeout', 60),
+            max_retries=0,
+        )
+        self.model = cfg.get('model', 'gpt-4-1106-preview')
+        self.batch_token_budget = cfg.get('batch_token_budget', self.batch_token_budget)
+        self.supports_batch = self.batch_token_budget > 0
+
+        # one limiter per model and process, shared by all concurrent jobs
+        if cfg.get('max_concurrency', 8) > 1:
+            self.limiter = get_rate_limiter(
+                'openai:%s' % self.model,
+                cfg.get('max_concurrency', 8),
+                cfg.get('requests_per_minute', 0),
+                cfg.get('tokens_per_minute', 0),
+            )
+        self.caller = get_resilient_caller('openai:%s' % self.model, resilience_cfg)
 
     def get_languages(self):
         return langs
 
+    def version(self) -> str:
+        prompt = system_prompt('{from_lang}', '{to_lang}') + batch_system_prompt('{from_lang}', '{to_lang}')
+        return 'openai:%s:%s' % (self.model, hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:8])
+
+    def stats(self) -> dict:
+        return {**super().stats(), **self.caller.stats()}
+
     def translate(self, text: str, from_lang='ENGLISH', to_lang='SLOVENIAN') -> str:
-        response = self.client.chat.completions.create(
-            model='gpt-4-1106-preview',
-            temperature=0.2,
-            messages=[
-                { 'role': 'system', 'content': system_prompt(from_lang, to_lang) },
-                { 'role': 'user', 'content': text },
-            ]
+        return run_coroutine(self.atranslate(text, from_lang, to_lang))
+
+    def translate_batch(self, texts: list, from_lang='ENGLISH', to_lang='SLOVENIAN') -> list:
+        return run_coroutine(self.atranslate_batch(texts, from_lang, to_lang))
+
+    async def _complete(self, messages, kind):
+        response = await self.caller.call(
+            lambda: self.client.chat.completions.create(
+                model=self.model,
+                temperature=0.2,
+                messages=messages,
+            ),
+            kind,
+            is_retryable,
         )
+        return response.choices[0].message.content
+
+    async def atranslate(self, text: str, from_lang='ENGLISH', to_lang='SLOVENIAN') -> str:
+        return await self._complete([
+            { 'role': 'system', 'content': system_prompt(from_lang, to_lang) },
+            { 'role': 'user', 'content': text },
+        ], 'text')
+
+    async def atranslate_batch(self, texts: list, from_lang='ENGLISH', to_lang='SLOVENIAN') -> list:
+        translated = await self.atranslate_batch_partial(texts, from_lang, to_lang)
+
+        # segments that are missing, empty or malformed are requested one by one
+        missing = [i for i, translated_text in enumerate(translated) if translated_text is None]
+        retried = await asyncio.gather(*[self.atranslate(texts[i], from_lang, to_lang) for i in missing])
+        for i, translated_text in zip(missing, retried):
+            translated[i] = translated_text
+        return translated
 
-        translated_text = response.choices[0].message.content
-        return translated_text
\ No newline at end of file
+    async def atranslate_batch_partial(self, texts: list, from_lang='ENGLISH', to_lang='SLOVENIAN') -> list:
+        content = await self._complete(batch_messages(texts, from_lang, to_lang), 'batch')
+        translated = parse_segments(content, len(texts))
+        return [translated.get(i) for i in range(len(texts))]
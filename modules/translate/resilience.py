@@ -0,0 +1,233 @@
+import asyncio
+import bisect
+import random
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+_callers = {}
+_callers_lock = threading.Lock()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend that keeps failing."""
+
+
+class LatencyHistogram:
+    """Latency histogram with percentiles over the most recent calls.
+
+    Parameters
+    ----------
+    bounds: tuple
+        Upper bounds of the buckets in seconds, a last bucket takes the rest
+    window: int
+        Number of recent samples the percentiles are computed from
+    """
+
+    def __init__(self, bounds: tuple = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64), window: int = 512) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.recent = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.recent.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.recent)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> dict:
+        labels = ["<=%gs" % bound for bound in self.bounds] + [">%gs" % self.bounds[-1]]
+        return {
+            "count": sum(self.counts),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class CircuitBreaker:
+    """Stops calling a backend after failure_threshold consecutive failures.
+
+    After reset_timeout seconds one trial call is let through; it closes
+    the circuit again on success and reopens it on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial:
+            self.trial = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.trial or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial = False
+
+    def end_trial(self) -> None:
+        """Let the next call through as trial if this one recorded no outcome."""
+        self.trial = False
+
+
+class ResilientCaller:
+    """Runs backend calls with timeouts, retries, hedging and a circuit breaker.
+
+    Must only be used from the translator loop.
+
+    Parameters
+    ----------
+    timeout: float
+        Seconds after which a call is abandoned and retried
+    max_retries: int
+        Retries after the first attempt
+    backoff_base: float
+        Base delay in seconds, doubled on every retry
+    backoff_max: float
+        Upper bound of the retry delay
+    hedge: bool
+        Send a duplicate request once a call runs longer than the observed p95
+    hedge_min_samples: int
+        Calls to observe before the p95 is trusted for hedging
+    failure_threshold: int
+        Consecutive failures that open the circuit
+    reset_timeout: float
+        Seconds the circuit stays open before a trial call
+    """
+
+    def __init__(self, timeout: float = 60, max_retries: int = 4, backoff_base: float = 1,
+                 backoff_max: float = 30, hedge: bool = False, hedge_min_samples: int = 20,
+                 failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.histograms = {}
+        self.retries = 0
+        self.timeouts = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def backoff(self, attempt: int) -> float:
+        # full jitter: spreads retries of concurrent calls over the whole window
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def call(self, make_call: Callable[[], Awaitable], kind: str = "call",
+                   is_retryable: Callable[[Exception], bool] = lambda e: True):
+        """Await make_call() until it succeeds or the retries run out.
+
+        make_call must return a new awaitable on every call; kind selects
+        the latency histogram (e.g. single texts vs batches).
+        """
+        histogram = self.histograms.setdefault(kind, LatencyHistogram())
+        for attempt in range(self.max_retries + 1):
+            trial = self.breaker.state == "half-open"
+            if not self.breaker.allow():
+                raise CircuitOpenError("translator backend is failing, circuit open")
+            start = time.monotonic()
+            try:
+                result = await asyncio.wait_for(self._hedged(make_call, histogram), self.timeout)
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.timeouts += 1
+                elif not is_retryable(e):
+                    # e.g. a rejected request, the backend itself answered
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+            finally:
+                # a cancelled trial records nothing, the next call gets to try
+                if trial:
+                    self.breaker.end_trial()
+            self.breaker.record_success()
+            histogram.record(time.monotonic() - start)
+            return result
+
+    async def _hedged(self, make_call: Callable[[], Awaitable], histogram: LatencyHistogram):
+        p95 = histogram.percentile(0.95)
+        if not self.hedge or len(histogram) < self.hedge_min_samples:
+            return await make_call()
+
+        tasks = [asyncio.ensure_future(make_call())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=p95)
+            if not done:
+                self.hedged += 1
+                tasks.append(asyncio.ensure_future(make_call()))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedge_wins += 1
+                        return task.result()
+            # every request failed
+            return tasks[0].result()
+        finally:
+            # also runs when the timeout cancels us
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "circuit": self.breaker.state,
+            "latency": {kind: h.to_dict() for kind, h in self.histograms.items()},
+        }
+
+
+def get_resilient_caller(name: str, cfg: dict) -> ResilientCaller:
+    """Return the caller shared by all translators of the process with this name.
+
+    cfg holds the ResilientCaller arguments; only the first call's are used.
+    """
+    with _callers_lock:
+        caller = _callers.get(name)
+        if caller is None:
+            caller = ResilientCaller(**cfg)
+            _callers[name] = caller
+        return caller
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+_loop = None
+_loop_lock = threading.Lock()
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide event loop translator calls run on.
+
+    The loop runs in a daemon thread, so async clients keep their
+    connection pools between calls and all jobs share one scheduler.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="translate-loop", daemon=True).start()
+        return _loop
+
+
+def run_coroutine(coro):
+    """Run a coroutine on the translator loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate_per_minute.
+
+    Must only be used from the translator loop.
+
+    Parameters
+    ----------
+    rate_per_minute: float
+        Tokens added per minute, also the bucket capacity
+    """
+
+    def __init__(self, rate_per_minute: float) -> None:
+        self.capacity = float(rate_per_minute)
+        self.rate = self.capacity / 60
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        # larger requests than the capacity would never fit, they wait for a full bucket
+        amount = min(amount, self.capacity)
+        # the lock makes waiters queue in order instead of starving large requests
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+
+class RateLimiter:
+    """Bounds concurrent requests and their rate to an API.
+
+    Parameters
+    ----------
+    max_concurrency: int
+        Requests in flight at the same time
+    requests_per_minute: float
+        Request rate limit, 0 disables it
+    tokens_per_minute: float
+        Token rate limit, 0 disables it
+    """
+
+    def __init__(self, max_concurrency: int = 8, requests_per_minute: float = 0,
+                 tokens_per_minute: float = 0) -> None:
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.waited = 0.0
+
+    @asynccontextmanager
+    async def request(self, tokens: int = 0):
+        """Wait until a request of the given token cost may be sent."""
+        async with self._semaphore:
+            start = time.monotonic()
+            if self.requests is not None:
+                await self.requests.acquire(1)
+            if self.tokens is not None:
+                await self.tokens.acquire(tokens)
+            self.waited += time.monotonic() - start
+            yield
+
+    def stats(self) -> dict:
+        return {"rate_limit_wait_s": self.waited}
+
+
+def get_rate_limiter(name: str, max_concurrency: int = 8, requests_per_minute: float = 0,
+                     tokens_per_minute: float = 0) -> RateLimiter:
+    """Return the limiter shared by all translators of the process with this name.
+
+    The first call creates it, later calls reuse it with its original limits.
+    """
+    with _limiters_lock:
+        limiter: Optional[RateLimiter] = _limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(max_concurrency, requests_per_minute, tokens_per_minute)
+            _limiters[name] = limiter
+        return limiter
@@ -0,0 +1,186 @@
+import re
+import threading
+from pathlib import Path
+
+import torch
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+from .base import TranslateBase
+
+SENTENCE_END_RE = re.compile(r'(?<=[.!?;:])\s+')
+
+
+class Seq2SeqTranslator(TranslateBase):
+    """Local sequence-to-sequence translation model (MarianMT, NLLB, M2M100, ...).
+
+    Models are loaded from local directories only (as written by
+    `save_pretrained`), one per language pair, the first time the pair is
+    used. All texts of a translate_texts call are sorted by length and
+    decoded in dynamically sized batches, so little compute is spent on
+    padding; generation reuses the decoder's key/value cache. Texts longer
+    than the model's input limit are split into sentences, which are
+    translated in chunks that fit and joined again. Sentences longer than
+    the limit on their own are truncated and counted in stats().
+
+    A tiny randomly initialised model saved with `save_pretrained` is
+    enough to run the backend without network access.
+
+    config options:
+    - models: language pair ("English-Slovenian") to the model directory,
+      or to a dict with `path` and, for multilingual models, the tokenizer
+      language codes `src_lang` and `tgt_lang`
+    - device: torch device (default 'cpu')
+    - num_threads: torch intra-op threads, 0 keeps the torch default
+    - num_beams: 1 for greedy decoding (default 4)
+    - max_batch_size: texts per batch (default 32)
+    - max_batch_tokens: padded source tokens per batch (default 4096)
+    - max_length_ratio: output tokens per source token (default 2.0)
+    """
+
+    supports_batch = True
+
+    def init(self, cfg: dict):
+        self.pairs = {}
+        for pair, model_cfg in cfg.get('models', {}).items():
+            from_lang, to_lang = pair.split('-')
+            if isinstance(model_cfg, str):
+                model_cfg = {'path': model_cfg}
+            self.pairs[(from_lang.lower(), to_lang.lower())] = model_cfg
+
+        self.device = torch.device(cfg.get('device', 'cpu'))
+        if cfg.get('num_threads', 0):
+            torch.set_num_threads(cfg['num_threads'])
+        self.num_beams = cfg.get('num_beams', 4)
+        self.max_batch_size = cfg.get('max_batch_size', 32)
+        self.max_batch_tokens = cfg.get('max_batch_tokens', 4096)
+        self.max_length_ratio = cfg.get('max_length_ratio', 2.0)
+        self.models = {}
+        # the model runs on all cores already, pages take turns
+        self.lock = threading.Lock()
+        self.truncated = 0
+        self._stats_lock = threading.Lock()
+
+    def get_languages(self):
+        langs = {lang for pair in self.pairs for lang in pair}
+        return sorted(lang.capitalize() for lang in langs)
+
+    def version(self) -> str:
+        models = ','.join('%s-%s:%s' % (*pair, Path(cfg['path']).name) for pair, cfg in sorted(self.pairs.items()))
+        return 'seq2seq:%s:beams=%d' % (models, self.num_beams)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            truncated = self.truncated
+        return {**super().stats(), "truncated_sentences": truncated}
+
+    def load(self, from_lang, to_lang):
+        pair = (from_lang.lower(), to_lang.lower())
+        if pair not in self.models:
+            if pair not in self.pairs:
+                raise ValueError("no local model for %s to %s" % (from_lang, to_lang))
+            model_cfg = self.pairs[pair]
+            tokenizer = AutoTokenizer.from_pretrained(model_cfg['path'], local_files_only=True)
+            if 'src_lang' in model_cfg:
+                tokenizer.src_lang = model_cfg['src_lang']
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_cfg['path'], local_files_only=True)
+            model.to(self.device).eval()
+
+            generate_kwargs = {}
+            if 'tgt_lang' in model_cfg:
+                generate_kwargs['forced_bos_token_id'] = tokenizer.convert_tokens_to_ids(model_cfg['tgt_lang'])
+            self.models[pair] = (tokenizer, model, generate_kwargs)
+        return self.models[pair]
+
+    def batches(self, lengths: list) -> list:
+        """Group text indices into batches of similar length.
+
+        Indices are taken longest first; a batch is closed once another
+        text would exceed max_batch_size texts or max_batch_tokens padded
+        tokens (the longest text times the batch size).
+        """
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+        batches, batch = [], []
+        for i in order:
+            # the first text of a batch is its longest
+            width = lengths[batch[0]] if batch else lengths[i]
+            if batch and (len(batch) >= self.max_batch_size or width * (len(batch) + 1) > self.max_batch_tokens):
+                batches.append(batch)
+                batch = []
+            batch.append(i)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def split(self, text: str, tokenizer, max_length: int) -> list:
+        """Split a text into runs of whole sentences of at most max_length tokens.
+
+        A sentence longer than that on its own is truncated by the tokenizer
+        and counted in stats().
+        """
+        sentences = SENTENCE_END_RE.split(text)
+        lengths = [len(ids) for ids in tokenizer(sentences)['input_ids']]
+        truncated = sum(length > max_length for length in lengths)
+        if truncated:
+            with self._stats_lock:
+                self.truncated += truncated
+
+        chunks, chunk, chunk_length = [], [], 0
+        for sentence, length in zip(sentences, lengths):
+            if chunk and chunk_length + length > max_length:
+                chunks.append(' '.join(chunk))
+                chunk, chunk_length = [], 0
+            chunk.append(sentence)
+            chunk_length += length
+        chunks.append(' '.join(chunk))
+        return chunks
+
+    def translate_texts(self, texts: list, from_lang, to_lang) -> list:
+        if not texts:
+            return []
+        tokenizer, model, generate_kwargs = self.load(from_lang, to_lang)
+        max_length = tokenizer.model_max_length if tokenizer.model_max_length < 100000 else 512
+
+        # texts over the input limit are translated sentence chunk by chunk
+        pieces, owners = [], []
+        for i, (text, ids) in enumerate(zip(texts, tokenizer(texts)['input_ids'])):
+            chunks = self.split(text, tokenizer, max_length) if len(ids) > max_length else [text]
+            pieces.extend(chunks)
+            owners.extend([i] * len(chunks))
+
+        translated_pieces = self.generate(pieces, tokenizer, model, generate_kwargs, max_length)
+        translated = [[] for _ in texts]
+        for i, translated_text in zip(owners, translated_pieces):
+            translated[i].append(translated_text)
+        return [' '.join(parts) for parts in translated]
+
+    def translate_batch(self, texts: list, from_lang, to_lang) -> list:
+        # batches of a limiter are batched again by length in translate_texts
+        return self.translate_texts(texts, from_lang, to_lang)
+
+    def generate(self, texts: list, tokenizer, model, generate_kwargs: dict, max_length: int) -> list:
+        lengths = [len(ids) for ids in tokenizer(texts, truncation=True, max_length=max_length)['input_ids']]
+
+        translated = [None] * len(texts)
+        with self.lock, torch.inference_mode():
+            for batch in self.batches(lengths):
+                inputs = tokenizer(
+                    [texts[i] for i in batch],
+                    return_tensors='pt',
+                    padding=True,
+                    truncation=True,
+                    max_length=max_length,
+                ).to(self.device)
+                outputs = model.generate(
+                    **inputs,
+                    num_beams=self.num_beams,
+                    do_sample=False,
+                    use_cache=True,
+                    max_new_tokens=max(8, int(lengths[batch[0]] * self.max_length_ratio)),
+                    **generate_kwargs,
+                )
+                for i, translated_text in zip(batch, tokenizer.batch_decode(outputs, skip_special_tokens=True)):
+                    translated[i] = translated_text
+        return translated
+
+    def translate(self, text: str, from_lang='ENGLISH', to_lang='SLOVENIAN') -> str:
+        return self.translate_texts([text], from_lang, to_lang)[0]
@@ -0,0 +1,143 @@
+import re
+import threading
+from collections import Counter
+from typing import Optional
+
+URL_RE = re.compile(
+    r"(?:https?://|www\.)\S+"               # web addresses
+    r"|(?:doi:\s*|https?://doi\.org/)?10\.\d{4,9}/\S+"  # DOIs
+    r"|[\w.+-]+@[\w-]+\.[\w.-]+",           # e-mail addresses
+    re.I,
+)
+LATEX_RE = re.compile(r"\\[a-zA-Z]+|\$[^$]*\$")
+CODE_LINE_RE = re.compile(r"[;{}:]\s*$|^\s*(?:def|class|import|from|return|for|if|while|#include|//)\b")
+MATH_CHARS = set("=+-*/^_<>≤≥≈≠±×÷∑∏∫∂∇√∞∈∉⊂⊆∪∩∀∃→←↔|()[]{}")
+WORD_RE = re.compile(r"[^\W\d_]+", re.U)
+
+# unicode ranges of the scripts that identify a language by themselves
+SCRIPTS = {
+    "cyrillic": [(0x0400, 0x052F)],
+    "greek": [(0x0370, 0x03FF)],
+    "arabic": [(0x0600, 0x06FF), (0x0750, 0x077F)],
+    "hebrew": [(0x0590, 0x05FF)],
+    "devanagari": [(0x0900, 0x097F)],
+    "thai": [(0x0E00, 0x0E7F)],
+    "hangul": [(0xAC00, 0xD7AF), (0x1100, 0x11FF)],
+    "kana": [(0x3040, 0x30FF)],
+    "han": [(0x4E00, 0x9FFF), (0x3400, 0x4DBF)],
+}
+LANGUAGE_SCRIPTS = {
+    "russian": "cyrillic", "ukrainian": "cyrillic", "bulgarian": "cyrillic",
+    "serbian": "cyrillic", "macedonian": "cyrillic", "belarusian": "cyrillic",
+    "greek": "greek", "arabic": "arabic", "persian": "arabic", "urdu": "arabic",
+    "hebrew": "hebrew", "hindi": "devanagari", "marathi": "devanagari", "nepali": "devanagari",
+    "thai": "thai", "korean": "hangul", "japanese": "kana", "chinese": "han",
+}
+# a handful of very frequent words, enough to tell Latin-script languages apart
+STOPWORDS = {
+    "english": {"the", "and", "of", "to", "in", "is", "that", "for", "with", "are", "this", "on"},
+    "slovenian": {"in", "je", "na", "da", "se", "za", "so", "ki", "pri", "z", "v", "tudi", "ali"},
+    "german": {"der", "die", "und", "das", "ist", "nicht", "mit", "ein", "eine", "zu", "von", "den"},
+    "french": {"le", "la", "les", "et", "des", "est", "une", "un", "du", "que", "pour", "dans"},
+    "spanish": {"el", "la", "los", "las", "y", "de", "que", "es", "en", "un", "una", "por"},
+    "italian": {"il", "la", "di", "che", "e", "è", "un", "una", "per", "del", "della", "sono"},
+    "croatian": {"je", "i", "u", "na", "da", "se", "za", "su", "od", "koji", "ili", "biti"},
+    "portuguese": {"o", "a", "os", "as", "e", "de", "que", "é", "um", "uma", "para", "não"},
+    "dutch": {"de", "het", "een", "en", "van", "is", "dat", "op", "te", "zijn", "niet", "met"},
+}
+
+
+def script_of(char: str) -> Optional[str]:
+    code = ord(char)
+    for script, ranges in SCRIPTS.items():
+        if any(start <= code <= end for start, end in ranges):
+            return script
+    return None
+
+
+class SkipClassifier:
+    """Recognizes blocks that need no translation.
+
+    Page numbers, equations, URLs, DOIs, code, numeric tables and text
+    already in the target language are passed through unchanged.
+
+    Parameters
+    ----------
+    min_letter_ratio: float
+        Blocks with a smaller share of letters among their non-space
+        characters are skipped (numbers, tables, formulas)
+    min_letters: int
+        Blocks with fewer letters are skipped
+    """
+
+    def __init__(self, min_letter_ratio: float = 0.5, min_letters: int = 2) -> None:
+        self.min_letter_ratio = min_letter_ratio
+        self.min_letters = min_letters
+        self.checked = 0
+        self.skipped = Counter()
+        self._lock = threading.Lock()
+
+    def reason(self, text: str, from_lang: str = "", to_lang: str = "") -> Optional[str]:
+        """Return why a text should not be translated, or None to translate it."""
+        chars = [c for c in text if not c.isspace()]
+        letters = sum(c.isalpha() for c in chars)
+        if letters < self.min_letters:
+            return "no_text"
+
+        rest = URL_RE.sub("", text)
+        if sum(c.isalpha() for c in rest) < self.min_letters:
+            return "url"
+
+        if LATEX_RE.search(rest) and len(LATEX_RE.sub("", rest).split()) <= 3:
+            return "math"
+        if letters / len(chars) < self.min_letter_ratio:
+            math = sum(c in MATH_CHARS for c in chars)
+            return "math" if math > letters / 4 else "numeric"
+
+        lines = [line for line in text.splitlines() if line.strip()]
+        if len(lines) > 1 and sum(bool(CODE_LINE_RE.search(line)) for line in lines) > len(lines) / 2:
+            return "code"
+
+        if self.in_language(text, to_lang) and not self.in_language(text, from_lang):
+            return "target_language"
+        return None
+
+    @staticmethod
+    def in_language(text: str, lang: str) -> bool:
+        """Cheap check whether a text is written in lang."""
+        lang = (lang or "").lower()
+        script = LANGUAGE_SCRIPTS.get(lang)
+        if script is not None:
+            letters = [c for c in text if c.isalpha()]
+            scripts = [script_of(c) for c in letters]
+            if script == "kana":
+                # Japanese mixes kana with Han characters
+                return scripts.count("kana") > 0 and scripts.count("kana") + scripts.count("han") > len(letters) / 2
+            return scripts.count(script) > len(letters) / 2
+
+        stopwords = STOPWORDS.get(lang)
+        if stopwords is None:
+            return False
+        words = WORD_RE.findall(text.lower())
+        if not words or any(script_of(c) is not None for c in text if c.isalpha()):
+            return False
+        hits = sum(word in stopwords for word in words)
+        return hits >= 2 and hits / len(words) >= 0.15
+
+    def check(self, text: str, from_lang: str = "", to_lang: str = "") -> bool:
+        """True if the text should be translated, counts the skipped ones."""
+        reason = self.reason(text, from_lang, to_lang)
+        with self._lock:
+            self.checked += 1
+            if reason is not None:
+                self.skipped[reason] += 1
+        return reason is None
+
+    def stats(self) -> dict:
+        skipped = sum(self.skipped.values())
+        return {
+            "skip_checked": self.checked,
+            "skip_calls_saved": skipped,
+            "skip_rate": skipped / self.checked if self.checked else 0.0,
+            "skip_reasons": dict(self.skipped),
+        }
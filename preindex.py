@@ -0,0 +1,110 @@
+import argparse
+from pathlib import Path
+
+from tqdm import tqdm
+
+from modules import load_layout_engine, load_ocr_engine
+from utils import iter_pdf_pages, load_config
+from utils.layout_cache import load_layout_cache
+
+
+def preindex_pdf(input_pdf_path: Path, layout_engine, ocr_engine, layout_cache, dpi: int) -> int:
+    """Runs layout detection and OCR for every page of a PDF and caches the results.
+
+    Parameters
+    ----------
+    input_pdf_path : Path
+        Path to the PDF to be indexed.
+    layout_engine : LayoutBase
+        Layout engine used by the server.
+    ocr_engine : OCRBase
+        OCR engine used by the server.
+    layout_cache : LayoutCache
+        Cache the results are stored in.
+    dpi : int
+        Rasterization resolution, must match the server.
+
+    Returns
+    -------
+    int
+        Number of pages that were not cached yet.
+    """
+    indexed = 0
+    for _, image in tqdm(iter_pdf_pages(input_pdf_path, dpi), desc=input_pdf_path.name):
+        key = layout_cache.key(image)
+        if layout_cache.get(key, image) is not None:
+            continue
+
+        result = layout_engine.get_single_layout(image)
+        result = ocr_engine.get_all_text(result, image)
+        layout_cache.put(key, result)
+        indexed += 1
+
+    return indexed
+
+
+def main(args: argparse.Namespace) -> None:
+    """Warms the layout cache for a PDF or all PDFs in a directory.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Arguments passed to the script.
+
+    Raises
+    ------
+     ValueError
+        If the input path is not a valid path to file or directory.
+
+    Notes
+    -----
+    args must have the following attributes:
+        input_pdf_path_or_dir : Path
+            Path to the PDF or directory of PDFs to be indexed.
+        dpi : int
+            Rasterization resolution, must match the server.
+    """
+    if args.input_pdf_path_or_dir.is_file():
+        if args.input_pdf_path_or_dir.suffix != ".pdf":
+            raise ValueError(
+                f"Input file must be a PDF or directory: {args.input_pdf_path_or_dir}"
+            )
+        input_pdf_paths = [args.input_pdf_path_or_dir]
+    elif args.input_pdf_path_or_dir.is_dir():
+        input_pdf_paths = sorted(args.input_pdf_path_or_dir.rglob("*.pdf"))
+        if not input_pdf_paths:
+            raise ValueError(f"Input directory is empty: {args.input_pdf_path_or_dir}")
+    else:
+        raise ValueError(
+            f"Input path must be a file or directory: {args.input_pdf_path_or_dir}"
+        )
+
+    cfg = load_config('config.yaml', 'config.dev.yaml')
+    layout_cache = load_layout_cache(cfg, force=True)
+    layout_engine = load_layout_engine(cfg['layout'])
+    ocr_engine = load_ocr_engine(cfg['ocr'])
+
+    for input_pdf_path in input_pdf_paths:
+        indexed = preindex_pdf(input_pdf_path, layout_engine, ocr_engine, layout_cache, args.dpi)
+        print(f"{input_pdf_path}: {indexed} new pages cached")
+
+    print("Done.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-i",
+        "--input_pdf_path_or_dir",
+        type=Path,
+        required=True,
+        help="Path to the PDF or directory of PDFs to be indexed.",
+    )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=200,
+        help="Rasterization resolution, must match the server. (default: 200)",
+    )
+    args = parser.parse_args()
+    main(args)
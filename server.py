@@ -1,31 +1,45 @@
+import asyncio
+import base64
+import io
+import json
+import os
 import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple, Union
-import matplotlib.pyplot as plt
+from typing import Callable, List, Optional, Tuple, Union
 import numpy as np
-import PyPDF2
 import uvicorn
-from fastapi import FastAPI, File, Form, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 #from starlette.middleware.wsgi import WSGIMiddleware
-from pdf2image import convert_from_bytes, convert_from_path
 from PIL import Image, ImageDraw, ImageFont
 from pydantic import BaseModel, Field
 from tqdm import tqdm
 import gradio as gr
 
 
-from utils import fw_fill, create_gradio_app, load_config, draw_text
+from utils import fw_fill, create_gradio_app, load_config, draw_text, iter_pdf_pages
+from utils.cache import FileCache, make_key
+from utils.jobs import Job, JobStore
+from utils.layout_cache import load_layout_cache
+from utils.memory import PageBudget, peak_rss_mb
+from utils.pdf_pages import get_page_count, page_range
+from utils.pdf_writer import PdfImageWriter, concat_side_by_side
+from utils.pipeline import PageTask, Stage, run_pages
+from utils.worker_pool import PageWorkerPool
 from modules import load_translator, load_layout_engine, load_ocr_engine, load_font_engine
+from modules.translate.dedup import DocumentDeduper
 
 
 
 
+# engines are created by TranslateApi, not at import time: worker processes
+# of the 'process' pipeline mode re-import this module and load their own
 cfg = load_config('config.yaml', 'config.dev.yaml')
-translator = load_translator(cfg['translator'])
-layout_engine = load_layout_engine(cfg['layout'])
-ocr_engine = load_ocr_engine(cfg['ocr'])
-font_engine = load_font_engine(cfg['font'])
 
 
 
@@ -46,16 +60,28 @@ class TranslateApi:
         Temporary directory for storing translated PDF files
     temp_dir_name: Path
         Path to the temporary directory
-    font: ImageFont
-        Font for drawing text on the image
-    layout_model: PPStructure
-        Layout model for detecting text blocks
-    ocr_model: PaddleOCR
-        OCR model for detecting text in the text blocks
-    translate_model: MarianMTModel
-        Translation model for translating text
-    translate_tokenizer: MarianTokenizer
-        Tokenizer for the translation model
+    translator: TranslateBase
+        Translation engine (OpenAI GPT, a local seq2seq model such as
+        MarianMT, or an offline benchmark backend)
+    layout_engine: LayoutBase
+        Layout engine for detecting text blocks (not loaded in 'process' mode)
+    ocr_engine: OCRBase
+        OCR engine for detecting text in the text blocks (not loaded in 'process' mode)
+    font_engine: FontBase
+        Font engine for picking the font of the translated text
+    worker_pool: PageWorkerPool
+        Layout/OCR worker processes (only in 'process' mode)
+    executor: ThreadPoolExecutor
+        Threads running translations off the event loop, its size caps
+        the number of translations in flight
+    jobs: JobStore
+        Translation jobs, each with its own directory in the temp directory.
+        Jobs of /translate_pdf/ are removed once the response is sent,
+        finished jobs of the job API after `server.job_ttl` seconds
+    result_cache: FileCache
+        Finished translations keyed by input and settings (None if disabled)
+    layout_cache: LayoutCache
+        Layout and OCR results per page image (None if disabled)
     """
 
     DPI = 200
@@ -68,17 +94,76 @@ class TranslateApi:
             methods=["POST"],
             response_class=FileResponse,
         )
+        self.app.add_api_route(
+            "/translate_pdf_stream/",
+            self.translate_pdf_stream,
+            methods=["POST"],
+            response_class=StreamingResponse,
+        )
         self.app.add_api_route(
             "/clear_temp_dir/",
             self.clear_temp_dir,
             methods=["GET"],
         )
+        self.app.add_api_route(
+            "/jobs/",
+            self.submit_job,
+            methods=["POST"],
+        )
+        self.app.add_api_route(
+            "/jobs/{job_id}",
+            self.job_status,
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/jobs/{job_id}/result",
+            self.job_result,
+            methods=["GET"],
+            response_class=FileResponse,
+        )
+        self.app.add_api_route(
+            "/jobs/{job_id}",
+            self.delete_job,
+            methods=["DELETE"],
+        )
+
+        self.pipeline_cfg = cfg.get('pipeline', {})
+        self.server_cfg = cfg.get('server', {})
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.server_cfg.get('max_concurrent_translations', 1),
+            thread_name_prefix="translate",
+        )
+        self.app.add_event_handler("shutdown", self.executor.shutdown)
+        self.translator = load_translator(cfg['translator'])
+        self.dedup = cfg['translator'].get('document_dedup', False)
+        self.memory = cfg['translator'].get('memory', {}).get('enabled', False)
+        self.font_engine = load_font_engine(cfg['font'])
+        self.worker_pool = None
+        if self.pipeline_cfg.get('mode') == 'process':
+            self.worker_pool = PageWorkerPool(
+                cfg['layout'], cfg['ocr'], self.pipeline_cfg.get('processes', 2)
+            )
+            self.app.add_event_handler("shutdown", self.worker_pool.shutdown)
+        else:
+            self.layout_engine = load_layout_engine(cfg['layout'])
+            self.ocr_engine = load_ocr_engine(cfg['ocr'])
 
-        gradioapp = create_gradio_app(translator.get_languages())
+        gradioapp = create_gradio_app(self.translator.get_languages())
         gr.mount_gradio_app(self.app, gradioapp, '/')
 
         self.temp_dir = tempfile.TemporaryDirectory()
         self.temp_dir_name = Path(self.temp_dir.name)
+        self.jobs = JobStore(self.temp_dir_name, self.server_cfg.get('job_ttl', 3600))
+
+        results_cfg = cfg.get('cache', {}).get('results', {})
+        self.result_cache = None
+        if results_cfg.get('enabled', False):
+            self.result_cache = FileCache(
+                Path(results_cfg.get('dir', 'temp/cache/results')),
+                results_cfg.get('max_size_mb', 1024),
+                suffix=".pdf",
+            )
+        self.layout_cache = load_layout_cache(cfg)
 
     
     def run(self):
@@ -86,97 +171,388 @@ class TranslateApi:
         uvicorn.run(self.app, host="0.0.0.0", port=8765)
 
     async def translate_pdf(self, input_pdf: UploadFile = File(...), from_lang: str = Form(...), to_lang: str = Form(...), p_from: int = Form(...), p_to: int = Form(...), side_by_side: bool = Form(...) ) -> FileResponse:
-        """API endpoint for translating PDF files."""
+        """API endpoint for translating PDF files.
+
+        The translation runs in the executor so the event loop keeps
+        serving other requests. Requests beyond the configured number of
+        concurrent translations wait for a free executor thread.
+        """
         input_pdf_data = await input_pdf.read()
-        self._translate_pdf(input_pdf_data, self.temp_dir_name, from_lang, to_lang, p_from, p_to, side_by_side)
 
+        # every request runs as a job with its own directory, so concurrent
+        # requests do not overwrite each other's output
+        job = self.jobs.create()
+        try:
+            # cached results are served from a copy in the job directory,
+            # the cache may evict its file while the response is sent
+            cached = self.result_cache is not None and await asyncio.to_thread(
+                self.result_cache.copy_to,
+                self.__result_key(input_pdf_data, from_lang, to_lang, p_from, p_to, side_by_side),
+                job.result_path,
+            )
+            if not cached:
+                await asyncio.wrap_future(
+                    self.executor.submit(self.__run_job, job, input_pdf_data, from_lang, to_lang, p_from, p_to, side_by_side)
+                )
+        except BaseException:
+            self.jobs.remove(job.id)
+            raise
+
+        # nobody can ask for the job afterwards, its files go with the response
         return FileResponse(
-            self.temp_dir_name / "translated.pdf", media_type="application/pdf"
+            job.result_path, media_type="application/pdf",
+            background=BackgroundTask(self.jobs.remove, job.id),
         )
 
+    async def translate_pdf_stream(self, input_pdf: UploadFile = File(...), from_lang: str = Form(...), to_lang: str = Form(...), p_from: int = Form(...), p_to: int = Form(...), side_by_side: bool = Form(...), page_format: str = Form("png") ) -> StreamingResponse:
+        """API endpoint streaming translated pages as server-sent events.
+
+        Every page is sent as a `page` event as soon as it is rendered,
+        in page order, with the page encoded as base64 PNG or single-page
+        PDF (`page_format`). The stream ends with a `done` event carrying
+        the job id, whose complete document is available from
+        `/jobs/{job_id}/result`, or with an `error` event.
+        """
+        if page_format not in ("png", "pdf"):
+            raise HTTPException(status_code=422, detail="page_format must be 'png' or 'pdf'")
+
+        input_pdf_data = await input_pdf.read()
+        job = self.jobs.create()
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def on_page(index: int, page: np.ndarray) -> None:
+            data = base64.b64encode(self.__encode_page(page, page_format)).decode("ascii")
+            loop.call_soon_threadsafe(
+                events.put_nowait, ("page", {"page": index, "format": page_format, "data": data})
+            )
+
+        future = asyncio.wrap_future(
+            self.executor.submit(self.__run_job, job, input_pdf_data, from_lang, to_lang, p_from, p_to, side_by_side, on_page)
+        )
+        future.add_done_callback(lambda _: events.put_nowait(None))
+
+        async def event_stream():
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield self.__sse(*event)
+
+            if future.exception() is not None:
+                yield self.__sse("error", job.to_dict())
+            else:
+                yield self.__sse("done", job.to_dict())
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    async def submit_job(self, input_pdf: UploadFile = File(...), from_lang: str = Form(...), to_lang: str = Form(...), p_from: int = Form(...), p_to: int = Form(...), side_by_side: bool = Form(...) ) -> dict:
+        """API endpoint for submitting a translation job.
+
+        Returns immediately with the job id. Progress is reported by
+        `/jobs/{job_id}` and the result is served by `/jobs/{job_id}/result`.
+        """
+        input_pdf_data = await input_pdf.read()
+        job = self.jobs.create()
+        future = self.executor.submit(self.__run_job, job, input_pdf_data, from_lang, to_lang, p_from, p_to, side_by_side)
+        # nobody awaits the future, errors would be lost without this
+        future.add_done_callback(partial(self.__log_job_error, job))
+        return job.to_dict()
+
+    async def job_status(self, job_id: str) -> dict:
+        """API endpoint reporting the status and page progress of a job."""
+        return self.__get_job(job_id).to_dict()
+
+    async def job_result(self, job_id: str) -> FileResponse:
+        """API endpoint returning the translated PDF of a finished job."""
+        job = self.__get_job(job_id)
+        if job.status != "done":
+            raise HTTPException(status_code=409, detail=f"job is {job.status}")
+        return FileResponse(job.result_path, media_type="application/pdf")
+
+    async def delete_job(self, job_id: str) -> dict:
+        """API endpoint removing a job and its files."""
+        self.__get_job(job_id)
+        self.jobs.remove(job_id)
+        return {"message": "job deleted"}
+
     async def clear_temp_dir(self):
-        """API endpoint for clearing the temporary directory."""
-        self.temp_dir.cleanup()
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.temp_dir_name = Path(self.temp_dir.name)
-        return {"message": "temp dir cleared"}
+        """API endpoint for clearing the temporary directory.
 
-    def _translate_pdf(
-        self, pdf_path_or_bytes: Union[Path, bytes], output_dir: Path, from_lang, to_lang, p_from, p_to, side_by_side
+        Removes the files of all finished jobs, queued and running jobs
+        are left alone.
+        """
+        removed = self.jobs.remove_finished()
+        return {"message": "temp dir cleared", "jobs_removed": len(removed)}
+
+    def __get_job(self, job_id: str) -> Job:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="unknown job")
+        return job
+
+    @staticmethod
+    def __log_job_error(job: Job, future) -> None:
+        exc = future.exception()
+        if exc is not None:
+            print(f"job {job.id} failed:")
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+    def __run_job(
+        self, job: Job, pdf_path_or_bytes: Union[Path, bytes], from_lang, to_lang, p_from, p_to, side_by_side,
+        on_page: Optional[Callable[[int, np.ndarray], None]] = None,
     ) -> None:
+        """Run a translation job in an executor thread and track its progress."""
+        job.status = "running"
+        try:
+            pages = page_range(get_page_count(pdf_path_or_bytes), p_from, p_to)
+            job.pages_total = len(pages)
+
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self.__result_key(pdf_path_or_bytes, from_lang, to_lang, p_from, p_to, side_by_side)
+                if self.result_cache.copy_to(cache_key, job.result_path):
+                    if on_page is not None:
+                        # streaming clients still get their page events, from the cached document
+                        for index, (_, image) in zip(pages, iter_pdf_pages(job.result_path, self.DPI)):
+                            on_page(index, np.array(image.convert("RGB")))
+                            job.pages_done += 1
+                    job.pages_done = job.pages_total
+                    job.status = "done"
+                    return
+
+            def track_page(index: int, page: np.ndarray) -> None:
+                job.pages_done += 1
+                if on_page is not None:
+                    on_page(index, page)
+
+            stats = self._translate_pdf(pdf_path_or_bytes, job.work_dir, from_lang, to_lang, p_from, p_to, side_by_side, on_page=track_page)
+            job.peak_rss_mb = self.peak_rss_mb()
+            job.translator_calls_saved = stats.get('translator_calls_saved')
+            job.translator_stats = stats.get('translator')
+            if cache_key is not None:
+                self.result_cache.put(cache_key, job.result_path)
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            raise
+        finally:
+            job.finished_at = time.time()
+
+    def __result_key(self, pdf_path_or_bytes: Union[Path, bytes], from_lang, to_lang, p_from, p_to, side_by_side) -> str:
+        """Cache key of a translation: input document, request and active config."""
+        if isinstance(pdf_path_or_bytes, Path):
+            pdf_path_or_bytes = pdf_path_or_bytes.read_bytes()
+        # everything that changes the output, without secrets like API keys
+        # and onnxruntime session settings (threads, profiling)
+        output_cfg = {
+            section: {
+                k: v for k, v in cfg.get(section, {}).items()
+                if not k.endswith('api_key') and k != 'onnxruntime'
+            }
+            for section in ('translator', 'layout', 'ocr', 'font')
+        }
+        return make_key(
+            pdf_path_or_bytes, from_lang, to_lang, int(p_from), int(p_to), bool(side_by_side), self.DPI, output_cfg
+        )
+
+    def __encode_page(self, page: np.ndarray, page_format: str) -> bytes:
+        buffer = io.BytesIO()
+        if page_format == "pdf":
+            with PdfImageWriter(buffer, dpi=self.DPI) as writer:
+                writer.add_page(page)
+        else:
+            Image.fromarray(page).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    @staticmethod
+    def __sse(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def _translate_pdf(
+        self, pdf_path_or_bytes: Union[Path, bytes], output_dir: Path, from_lang, to_lang, p_from, p_to, side_by_side,
+        on_page: Optional[Callable[[int, np.ndarray], None]] = None,
+    ) -> dict:
         """Backend function for translating PDF files.
 
         Translation is performed in the following steps:
-            1. Convert the PDF file to images
+            1. Convert the requested pages to images, one at a time
             2. Detect text blocks in the images (layout detection)
             3. For each text block, detect text (ocr)
             4. translate the text
             5. detect font properties
             6. draw the new text        
-            7. Merge all PDF files into one PDF file
+            7. Append the page to the output PDF file
 
         At 3, this function does not translate the text after
         the references section. Instead, saves the image as it is.
 
+        With `translator.document_dedup`, blocks repeated across pages
+        (headers, footers) are translated once per document at 4.
+
+        Steps 2-5 run as pipeline stages. With `pipeline.mode: threaded`
+        they overlap across pages, so page N+1 can be in layout/OCR while
+        page N is being translated. Pages are always rendered in order.
+
         Parameters
         ----------
         pdf_path_or_bytes: Union[Path, bytes]
             Path to the input PDF file or bytes of the input PDF file
         output_dir: Path
-            Path to the output directory
+            Path to the output directory, the result is written to
+            "translated.pdf" in it
+        on_page: Optional[Callable[[int, np.ndarray], None]]
+            Called with the page index and the rendered page every time
+            a page has been appended to the output
+
+        Returns
+        -------
+        dict
+            Document statistics, e.g. translator calls saved by deduplication
+            and, with a translation memory, its counters under "translator"
         """
 
-        if isinstance(pdf_path_or_bytes, Path):
-            pdf_images = convert_from_path(pdf_path_or_bytes, dpi=self.DPI)
-        else:
-            pdf_images = convert_from_bytes(pdf_path_or_bytes, dpi=self.DPI)
-        
-        pdf_files = []
-        
-        reached_references = False
-        for i, image in tqdm(enumerate(pdf_images)):
-            if i < p_from: continue
-            if i > p_to and p_to != 0: break
-            result = layout_engine.get_single_layout(image)
-            result = ocr_engine.get_all_text(result)
-            result = translator.translate_all(result, from_lang, to_lang)
-            result = font_engine.get_all_fonts(result)
-
-
-            output_path = output_dir / f"{i:03}.pdf"
-            if not reached_references:
-                # this function does steps 2-6
-                img, reached_references = self.__translate_one_page(
-                    image=image,
-                    result = result,
-                    reached_references=reached_references,
-                )
-                if side_by_side:
-                    fig, ax = plt.subplots(1, 2, figsize=(20, 14))
-                    ax[0].imshow(image)
-                    ax[1].imshow(img)
-                    ax[0].axis("off")
-                    ax[1].axis("off")
-                else:
-                    fig, ax = plt.subplots(1, 1, figsize=(10, 14))
-                    ax.imshow(img)
-                    ax.axis("off")
-                plt.tight_layout()
-                plt.savefig(output_path, format="pdf", dpi=self.DPI)
-                plt.close(fig)
-            else:
-                (
-                    image.convert("RGB")
-                    .resize((int(1400 / image.size[1] * image.size[0]), 1400))
-                    .save(output_path, format="pdf")
-                )
-
-            pdf_files.append(str(output_path))
-
+        # pages are rasterized lazily and only once a slot in the memory
+        # budget is free, a slot is given back after the page is written
+        budget = PageBudget(self.pipeline_cfg.get('max_resident_pages', 0))
+        pages = (
+            PageTask(index=i, image=image)
+            for i, image in budget.limit(iter_pdf_pages(pdf_path_or_bytes, self.DPI, p_from, p_to))
+        )
 
-        # 7. merge
-        self.__merge_pdfs(pdf_files)
+        output_path = output_dir / "translated.pdf"
+        partial_path = output_dir / "translated.pdf.part"
 
+        reached_references = False
+        translator = self.translator
+        if self.dedup:
+            translator = DocumentDeduper(self.translator, from_lang, to_lang)
+        stages = self.__page_stages(translator, from_lang, to_lang)
+        mode = self.pipeline_cfg.get('mode', 'sequential')
+        if mode == 'process':
+            # the stages are fed by threads, the heavy lifting happens in the pool
+            mode = 'threaded'
+        queue_size = self.pipeline_cfg.get('queue_size', 2)
+        try:
+            with PdfImageWriter(partial_path, dpi=self.DPI) as writer:
+                for page in tqdm(run_pages(pages, stages, mode, queue_size)):
+                    image, result = page.image, page.result
+
+                    if not reached_references:
+                        # this function does step 6
+                        img, reached_references = self.__translate_one_page(
+                            image=image,
+                            result = result,
+                            reached_references=reached_references,
+                        )
+                        if side_by_side:
+                            img = concat_side_by_side(np.array(image.convert("RGB")), img)
+                    else:
+                        img = np.array(image.convert("RGB"))
+
+                    # 7. append to the output document
+                    writer.add_page(img)
+                    if on_page is not None:
+                        on_page(page.index, img)
+
+                    # release the page before the next one is rasterized
+                    page.image = page.result = None
+                    del image, result, img
+                    budget.release()
+        finally:
+            # a failed page must not leave the page source waiting for a slot
+            budget.close()
+
+        # only expose complete documents under the final name
+        os.replace(partial_path, output_path)
+        if budget.max_pages > 0:
+            # sizing info for containers running with a page budget, jobs
+            # keep it in peak_rss_mb
+            print(f"peak RSS: {self.peak_rss_mb():.0f} MB")
+        stats = translator.stats() if self.dedup else {}
+        if stats:
+            print(f"document dedup: {stats}")
+        if self.memory:
+            # hit/miss counters of the translation memory, kept on the job
+            stats['translator'] = self.translator.stats()
+        return stats
+
+    def peak_rss_mb(self) -> float:
+        """Peak resident memory of the server, including layout/OCR worker processes."""
+        peak = peak_rss_mb()
+        if self.worker_pool is not None:
+            peak += self.worker_pool.peak_rss_mb()
+        return peak
+
+
+    def __page_stages(self, translator, from_lang, to_lang) -> List[Stage]:
+        """Build the per-page processing stages (steps 2-5).
+
+        The number of workers per stage is read from the
+        `pipeline.workers` section of the config and only matters in
+        'threaded' mode. In 'process' mode layout detection and OCR are
+        merged into one stage that runs in the worker pool.
+        """
+        workers = self.pipeline_cfg.get('workers', {})
+        if self.worker_pool is not None:
+            vision_stages = [
+                Stage('recognize', self.__recognize_stage, self.worker_pool.processes),
+            ]
+        else:
+            vision_stages = [
+                Stage('layout', self.__layout_stage, workers.get('layout', 1)),
+                Stage('ocr', self.__ocr_stage, workers.get('ocr', 1)),
+            ]
+        return vision_stages + [
+            Stage(
+                'translate',
+                partial(self.__translate_stage, translator=translator, from_lang=from_lang, to_lang=to_lang),
+                workers.get('translate', 1),
+            ),
+            Stage('font', self.__font_stage, workers.get('font', 1)),
+        ]
+
+    def __layout_stage(self, page: PageTask) -> PageTask:
+        if self.__load_cached_layout(page):
+            return page
+        page.result = self.layout_engine.get_single_layout(page.image)
+        return page
+
+    def __ocr_stage(self, page: PageTask) -> PageTask:
+        if page.from_cache:
+            return page
+        page.result = self.ocr_engine.get_all_text(page.result, page.image)
+        self.__store_layout(page)
+        return page
+
+    def __recognize_stage(self, page: PageTask) -> PageTask:
+        if self.__load_cached_layout(page):
+            return page
+        page.result = self.worker_pool.recognize(page.image)
+        self.__store_layout(page)
+        return page
+
+    def __load_cached_layout(self, page: PageTask) -> bool:
+        """Fill in layout and OCR results from the layout cache, if present."""
+        if self.layout_cache is None:
+            return False
+        page.cache_key = self.layout_cache.key(page.image)
+        page.result = self.layout_cache.get(page.cache_key, page.image)
+        page.from_cache = page.result is not None
+        return page.from_cache
+
+    def __store_layout(self, page: PageTask) -> None:
+        if page.cache_key is not None:
+            self.layout_cache.put(page.cache_key, page.result)
+
+    def __translate_stage(self, page: PageTask, translator, from_lang, to_lang) -> PageTask:
+        page.result = translator.translate_all(page.result, from_lang, to_lang)
+        return page
+
+    def __font_stage(self, page: PageTask) -> PageTask:
+        page.result = self.font_engine.get_all_fonts(page.result)
+        return page
 
     def __translate_one_page(
         self,
@@ -226,24 +602,6 @@ class TranslateApi:
 
         return img, reached_references
 
-    def __merge_pdfs(self, pdf_files: List[str]) -> None:
-        """Merge translated PDF files into one file.
-
-        Merged file will be stored in the temp directory
-        as "translated.pdf".
-
-        Parameters
-        ----------
-        pdf_files: List[str]
-            List of paths to translated PDF files stored in
-            the temp directory.
-        """
-        pdf_merger = PyPDF2.PdfMerger()
-
-        for pdf_file in sorted(pdf_files):
-            pdf_merger.append(pdf_file)
-        pdf_merger.write(self.temp_dir_name / "translated.pdf")
-
 
 if __name__ == "__main__":
     translate_api = TranslateApi()
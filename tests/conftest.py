@@ -0,0 +1,55 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# tests import the repo packages (modules, utils) like server.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FakeCompletions:
+    """chat.completions of an OpenAI client.
+
+    Answers every request with respond(user message, request number),
+    after delay seconds, and tracks how many requests are in flight.
+    """
+
+    def __init__(self, respond, delay=0):
+        self.respond = respond
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, model, temperature, messages):
+        self.requests.append(messages[-1]["content"])
+        number = len(self.requests)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        content = self.respond(messages[-1]["content"], number)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def openai_translator():
+    """Builds a TranslateOpenAIGPT talking to a FakeCompletions."""
+    pytest.importorskip("openai")
+    from modules.translate.openai_gpt import TranslateOpenAIGPT
+    from modules.translate.resilience import ResilientCaller
+
+    def make(respond, delay=0, limiter=None):
+        translator = TranslateOpenAIGPT()
+        completions = FakeCompletions(respond, delay)
+        translator.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        translator.model = "fake"
+        translator.caller = ResilientCaller(timeout=5, max_retries=0)
+        translator.limiter = limiter
+        return translator, completions
+
+    return make
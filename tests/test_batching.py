@@ -0,0 +1,70 @@
+import re
+
+import pytest
+
+from modules.translate.base import estimate_tokens, pack_batches
+from modules.translate.scheduler import RateLimiter
+
+
+def test_pack_batches_splits_at_the_token_budget():
+    texts = ["x" * 40] * 5  # 11 tokens each
+    assert [len(batch) for batch in pack_batches(texts, 25)] == [2, 2, 1]
+    assert [len(batch) for batch in pack_batches(texts, 55)] == [5]
+
+
+def test_pack_batches_gives_an_oversized_text_its_own_batch():
+    large = "y" * 400
+    assert estimate_tokens(large) > 25
+    batches = pack_batches(["a", large, "b", "c"], 25)
+    assert batches == [["a"], [large], ["b", "c"]]
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('<seg id="0">eins</seg>\n<seg id="1">zwei</seg>', {0: "eins", 1: "zwei"}),
+    # missing and empty segments
+    ('<seg id="1">zwei</seg>\n<seg id="2"> </seg>', {1: "zwei"}),
+    (None, {}),
+    # a repeated id with the same text is fine, with another text it is not
+    ('<seg id="0">eins</seg><seg id="0">eins</seg><seg id="1">zwei</seg>', {0: "eins", 1: "zwei"}),
+    ('<seg id="0">eins</seg><seg id="0">zwei</seg><seg id="1">zwei</seg>', {1: "zwei"}),
+    # ids the request did not have
+    ('<seg id="0">eins</seg><seg id="3">vier</seg>', {0: "eins"}),
+    # a dropped </seg> runs into the next segment
+    ('<seg id="0">eins\n<seg id="1">zwei</seg><seg id="2">drei</seg>', {2: "drei"}),
+])
+def test_parse_segments(content, expected):
+    openai_gpt = pytest.importorskip("modules.translate.openai_gpt")
+    assert openai_gpt.parse_segments(content, 3) == expected
+
+
+def test_segments_round_trip_through_the_batch_request(openai_translator):
+    openai_gpt = pytest.importorskip("modules.translate.openai_gpt")
+
+    def respond(content, number):
+        return re.sub(r">([^<]*)<", lambda m: ">%s<" % m.group(1).upper(), content)
+
+    translator, completions = openai_translator(respond)
+
+    texts = ["one", "two\nlines", "three"]
+    assert translator.translate_batch(texts, "English", "German") == ["ONE", "TWO\nLINES", "THREE"]
+    assert completions.requests == [openai_gpt.batch_messages(texts, "English", "German")[-1]["content"]]
+
+
+def test_missing_segments_are_requested_again_through_the_limiter(openai_translator):
+    def respond(content, number):
+        if number == 1:
+            # only the first of four segments comes back
+            return '<seg id="0">eins</seg>'
+        return content.upper()
+
+    limiter = RateLimiter(max_concurrency=2)
+    translator, completions = openai_translator(respond, delay=0.05, limiter=limiter)
+    translator.batch_token_budget = 100
+
+    texts = ["one", "two", "three", "four"]
+    assert translator.translate_texts(texts, "English", "German") == ["eins", "TWO", "THREE", "FOUR"]
+    # one batch request, then the three missing texts on their own
+    assert len(completions.requests) == 4
+    assert sorted(completions.requests[1:]) == ["four", "three", "two"]
+    # the retries run concurrently, but never more than the limiter allows
+    assert completions.max_in_flight == 2
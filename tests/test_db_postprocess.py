@@ -0,0 +1,75 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("shapely")
+pytest.importorskip("pyclipper")
+
+# loaded from its file, the ppocr.postprocess package imports every post process
+spec = importlib.util.spec_from_file_location(
+    "db_postprocess",
+    Path(__file__).resolve().parent.parent / "utils/ocr_model/ppocr_onnx/ppocr/postprocess/db_postprocess.py")
+db_postprocess = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(db_postprocess)
+
+
+def draw_bar(pred, center, size, angle, value):
+    box = cv2.boxPoints((center, size, angle))
+    cv2.fillPoly(pred, [np.round(box).astype(np.int32)], value)
+
+
+def page_with_overlaps(seed):
+    """
+    Probability map whose candidate boxes overlap: rings give an outer and
+    an inner contour, crossing diagonal bars nearly touch, some bars leave
+    the map
+    """
+    rng = np.random.default_rng(seed)
+    pred = rng.uniform(0, 0.2, (320, 480)).astype(np.float32)
+    for _ in range(4):
+        x, y = rng.uniform(40, 440), rng.uniform(40, 280)
+        w, h = rng.uniform(40, 80), rng.uniform(30, 60)
+        draw_bar(pred, (x, y), (w, h), rng.uniform(-10, 10), float(rng.uniform(0.6, 1.0)))
+        draw_bar(pred, (x, y), (w - 16, h - 16), rng.uniform(-10, 10), float(rng.uniform(0.0, 0.2)))
+    for _ in range(6):
+        x, y = rng.uniform(0, 480), rng.uniform(0, 320)
+        angle = rng.uniform(30, 60)
+        draw_bar(pred, (x, y), (rng.uniform(40, 120), 8), angle, float(rng.uniform(0.5, 1.0)))
+        draw_bar(pred, (x + 12, y), (rng.uniform(40, 120), 8), angle, float(rng.uniform(0.5, 1.0)))
+    return pred
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_matches_loop_with_overlapping_boxes(seed):
+    postprocess = db_postprocess.DBPostProcess(thresh=0.3, box_thresh=0.3, unclip_ratio=1.5)
+    pred = page_with_overlaps(seed)
+    mask = pred > postprocess.thresh
+
+    ref_boxes, ref_scores = postprocess.boxes_from_bitmap(pred, mask, 960, 640)
+    boxes, scores = postprocess.boxes_from_bitmap_vectorized(pred, mask, 960, 640)
+
+    assert len(ref_boxes) > 0
+    assert len(boxes) == len(ref_boxes)
+    np.testing.assert_allclose(scores, ref_scores, rtol=1e-5, atol=1e-6)
+    # pyclipper rounds the unclipped polygon to integers, 2 px at the map scale
+    assert np.abs(boxes - ref_boxes).max() <= 4
+
+
+def test_box_scores_fast_overlapping_boxes():
+    postprocess = db_postprocess.DBPostProcess()
+    pred = np.random.default_rng(0).uniform(0, 1, (60, 80)).astype(np.float32)
+    boxes = np.array([
+        [[10, 10], [50, 10], [50, 40], [10, 40]],
+        [[20, 15], [40, 15], [40, 30], [20, 30]],   # inside the first
+        [[45, 35], [70, 35], [70, 55], [45, 55]],   # overlaps the first
+        [[60, 2], [78, 2], [78, 20], [60, 20]],     # apart from all
+        [[-5, 50], [8, 50], [8, 70], [-5, 70]],     # leaves the map
+    ], dtype=np.float32)
+
+    scores = postprocess.box_scores_fast(pred, boxes)
+
+    expected = [postprocess.box_score_fast(pred, box) for box in boxes]
+    np.testing.assert_allclose(scores, expected, rtol=1e-5)
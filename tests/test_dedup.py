@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from modules.translate.base import TranslateBase
+from modules.translate.dedup import DocumentDeduper
+
+
+class BlockingTranslator(TranslateBase):
+    """Upper-cases texts once release is set; fails calls with a failing text."""
+
+    def __init__(self, failing=None):
+        self.calls = []
+        self.release = threading.Event()
+        self.failing = failing
+
+    def init(self, cfg):
+        pass
+
+    def get_languages(self):
+        return []
+
+    def translate(self, text, from_lang=None, to_lang=None):
+        return self.translate_texts([text], from_lang, to_lang)[0]
+
+    def translate_texts(self, texts, from_lang, to_lang):
+        self.calls.append(list(texts))
+        assert self.release.wait(5)
+        if self.failing in texts:
+            raise RuntimeError("backend down")
+        return [text.upper() for text in texts]
+
+
+def page(*texts):
+    return [SimpleNamespace(text=text, translated_text=None) for text in texts]
+
+
+def wait_for_calls(translator, count):
+    deadline = time.monotonic() + 5
+    while len(translator.calls) < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def translate_pages(deduper, translator, first, second):
+    """Translates two pages in threads; the second starts while the first is in the backend."""
+    with ThreadPoolExecutor(2) as pool:
+        first_done = pool.submit(deduper.translate_all, first)
+        wait_for_calls(translator, 1)
+        second_done = pool.submit(deduper.translate_all, second)
+        wait_for_calls(translator, 2)
+        translator.release.set()
+        # a timeout here means a page hangs on a group that will never finish
+        return [first_done.exception(timeout=5), second_done.exception(timeout=5)]
+
+
+def test_repeated_blocks_are_translated_once():
+    translator = BlockingTranslator()
+    deduper = DocumentDeduper(translator, "English", "German")
+    first, second = page("Header", "Page 1", "alpha"), page("Header", "Page 2", "beta")
+
+    assert translate_pages(deduper, translator, first, second) == [None, None]
+
+    assert translator.calls == [["Header", "Page 1", "alpha"], ["beta"]]
+    assert [line.translated_text for line in first] == ["HEADER", "PAGE 1", "ALPHA"]
+    assert [line.translated_text for line in second] == ["HEADER", "PAGE 2", "BETA"]
+    assert deduper.stats()["translator_calls_saved"] == 2
+
+
+def test_waiting_pages_get_the_backend_error():
+    translator = BlockingTranslator(failing="Header")
+    deduper = DocumentDeduper(translator, "English", "German")
+    first, second = page("Header", "alpha"), page("Header", "beta")
+
+    errors = translate_pages(deduper, translator, first, second)
+
+    assert [type(error) for error in errors] == [RuntimeError, RuntimeError]
+    # the second page translated its own block, only the shared one failed
+    assert translator.calls == [["Header", "alpha"], ["beta"]]
+    # the group stays failed for the rest of the document
+    with pytest.raises(RuntimeError):
+        deduper.translate_all(page("Header"))
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+paddle = pytest.importorskip("modules.ocr.paddle")
+from utils.layout_model import Layout
+from utils.ocr_model.ppocr_onnx.tools.infer.utility import group_lines
+
+
+def line_box(x1, y1, x2, y2):
+    return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.float32)
+
+
+class FakeOCRModel:
+    """Page-level OCR model answering from fixed boxes, the text is the box index."""
+
+    drop_score = 0.5
+
+    def __init__(self, boxes):
+        self.boxes = boxes
+        self.recognized = []
+
+    def detect_page(self, page):
+        return self.boxes, np.arange(len(self.boxes))
+
+    def recognize(self, page, boxes):
+        self.recognized.extend(boxes)
+        return [(str(int(box[0, 1])), 0.9) for box in boxes]
+
+    def group_lines(self, boxes):
+        return group_lines(boxes)
+
+
+def make_engine(boxes):
+    engine = paddle.PaddleOCR.__new__(paddle.PaddleOCR)
+    engine.page_level = True
+    engine.ocr_model = FakeOCRModel(boxes)
+    return engine
+
+
+def block(bbox, type_="text"):
+    return Layout(type=type_, bbox=np.array(bbox), score=1.0)
+
+
+def test_assign_boxes_overlapping_blocks():
+    boxes = [line_box(10, 10, 90, 20), line_box(10, 60, 90, 70), line_box(300, 10, 350, 20)]
+    inside = paddle.assign_boxes(boxes, [(0, 0, 100, 100), (0, 50, 100, 100)])
+    assert inside.tolist() == [[True, False], [True, True], [False, False]]
+
+
+def test_overlapping_blocks_all_get_their_lines():
+    boxes = [line_box(10, 10, 90, 20), line_box(10, 30, 90, 40), line_box(10, 60, 90, 70)]
+    outer, inner = block((0, 0, 100, 100)), block((0, 50, 100, 100))
+    engine = make_engine(boxes)
+
+    engine.get_all_text([outer, inner], np.zeros((120, 120, 3), dtype=np.uint8))
+
+    assert outer.text == "10 30 60"
+    assert outer.line_cnt == 3
+    assert inner.text == "60"
+    assert inner.line_cnt == 1
+    # the shared line is recognized once
+    assert len(engine.ocr_model.recognized) == 3
+
+
+def test_empty_block_has_a_line_count():
+    empty = block((200, 200, 300, 300))
+    make_engine([line_box(10, 10, 90, 20)]).get_all_text(
+        [empty, block((0, 0, 100, 100))], np.zeros((320, 320, 3), dtype=np.uint8)
+    )
+    assert empty.text == ""
+    assert empty.line_cnt == 1
@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+import pytest
+
+from modules.translate.resilience import CircuitOpenError, ResilientCaller
+
+
+class RejectedError(Exception):
+    """A request error that retrying does not fix, like an HTTP 400."""
+
+
+class FakeEndpoint:
+    """Async stand-in for a translation API.
+
+    Every request takes the next scripted step: ("ok", delay) answers
+    after delay seconds, ("error", exc) raises exc, ("hang",) never answers.
+    Once the script runs out, requests answer right away.
+    """
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.requests = 0
+
+    async def request(self):
+        self.requests += 1
+        step = self.steps.pop(0) if self.steps else ("ok", 0)
+        if step[0] == "hang":
+            await asyncio.Event().wait()
+        if step[0] == "error":
+            raise step[1]
+        await asyncio.sleep(step[1])
+        return "answer %d" % self.requests
+
+
+def is_retryable(e):
+    return not isinstance(e, RejectedError)
+
+
+def make_caller(**kwargs):
+    cfg = {"timeout": 0.2, "max_retries": 2, "backoff_base": 0, "backoff_max": 0}
+    cfg.update(kwargs)
+    return ResilientCaller(**cfg)
+
+
+def call(caller, endpoint):
+    return caller.call(endpoint.request, "text", is_retryable)
+
+
+def test_timeout_is_retried():
+    caller, endpoint = make_caller(), FakeEndpoint(("hang",), ("ok", 0))
+    assert asyncio.run(call(caller, endpoint)) == "answer 2"
+    assert caller.timeouts == 1
+    assert caller.retries == 1
+    assert caller.breaker.state == "closed"
+
+
+def test_retries_run_out():
+    caller = make_caller(max_retries=1, failure_threshold=10)
+    endpoint = FakeEndpoint(("error", ConnectionError()), ("error", ConnectionError()))
+    with pytest.raises(ConnectionError):
+        asyncio.run(call(caller, endpoint))
+    assert endpoint.requests == 2
+
+
+def test_non_retryable_error_is_not_retried():
+    caller, endpoint = make_caller(), FakeEndpoint(("error", RejectedError()))
+    with pytest.raises(RejectedError):
+        asyncio.run(call(caller, endpoint))
+    assert endpoint.requests == 1
+    assert caller.breaker.state == "closed"
+
+
+def test_hedged_request_wins():
+    caller = make_caller(timeout=5, hedge=True, hedge_min_samples=3)
+    endpoint = FakeEndpoint(("ok", 0.01), ("ok", 0.01), ("ok", 0.01), ("ok", 2), ("ok", 0.01))
+
+    async def run():
+        for _ in range(3):
+            await call(caller, endpoint)
+        start = time.monotonic()
+        result = await call(caller, endpoint)
+        return result, time.monotonic() - start
+
+    result, elapsed = asyncio.run(run())
+    assert result == "answer 5"
+    assert elapsed < 1
+    assert caller.hedged == 1
+    assert caller.hedge_wins == 1
+
+
+def test_breaker_opens_and_recovers():
+    caller = make_caller(max_retries=0, failure_threshold=2, reset_timeout=0.1)
+    endpoint = FakeEndpoint(("error", ConnectionError()), ("error", ConnectionError()))
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await call(caller, endpoint)
+        with pytest.raises(CircuitOpenError):
+            await call(caller, endpoint)
+        assert endpoint.requests == 2
+
+        await asyncio.sleep(0.1)
+        assert caller.breaker.state == "half-open"
+        return await call(caller, endpoint)
+
+    assert asyncio.run(run()) == "answer 3"
+    assert caller.breaker.state == "closed"
+
+
+@pytest.mark.parametrize("trial_step", [("error", RejectedError()), ("hang",)])
+def test_trial_without_outcome_does_not_block_the_breaker(trial_step):
+    caller = make_caller(max_retries=0, failure_threshold=1, reset_timeout=0.05, timeout=5)
+    endpoint = FakeEndpoint(("error", ConnectionError()), trial_step)
+
+    async def run():
+        with pytest.raises(ConnectionError):
+            await call(caller, endpoint)
+        await asyncio.sleep(0.05)
+
+        # the trial call is rejected, or cancelled by its caller
+        trial = asyncio.ensure_future(call(caller, endpoint))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises((RejectedError, asyncio.CancelledError)):
+            await trial
+
+        return await call(caller, endpoint)
+
+    assert asyncio.run(run()) == "answer 3"
+    assert caller.breaker.state == "closed"
+
+
+def test_openai_batch_through_fake_client(openai_translator):
+    def respond(content, number):
+        if number == 1:
+            # the first segment lost its </seg>
+            return '<seg id="0">eins\n<seg id="1">zwei</seg>\n<seg id="2">drei</seg>'
+        return content.upper()
+
+    translator, completions = openai_translator(respond)
+
+    assert translator.translate_batch(["one", "two", "three"], "English", "German") == ["ONE", "TWO", "drei"]
+    assert sorted(completions.requests[1:]) == ["one", "two"]
@@ -0,0 +1,86 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from modules.translate import scheduler
+from modules.translate.scheduler import RateLimiter
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the scheduler sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        # still yield to the loop like a real sleep
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    # only the scheduler module sees the fake clock, the event loop keeps the real one
+    monkeypatch.setattr(scheduler, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(scheduler, "asyncio", SimpleNamespace(**{**vars(asyncio), "sleep": clock.sleep}))
+    return clock
+
+
+def test_concurrency_never_exceeds_the_limit():
+    async def run():
+        limiter = RateLimiter(max_concurrency=3)
+        in_flight, peak = 0, 0
+
+        async def request():
+            nonlocal in_flight, peak
+            async with limiter.request():
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*[request() for _ in range(10)])
+        return peak
+
+    assert asyncio.run(run()) == 3
+
+
+def test_request_rate_waits_for_refill(clock):
+    async def run():
+        # one request per second, the first 60 fit the full bucket
+        limiter = RateLimiter(max_concurrency=100, requests_per_minute=60)
+        for _ in range(62):
+            async with limiter.request():
+                pass
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert clock.sleeps == pytest.approx([1, 1])
+    assert limiter.stats()["rate_limit_wait_s"] == pytest.approx(2)
+
+
+def test_token_cost_waits(clock):
+    async def run():
+        # 10 tokens per second, 600 in a full bucket
+        limiter = RateLimiter(max_concurrency=100, tokens_per_minute=600)
+        async with limiter.request(500):
+            pass
+        assert clock.sleeps == []
+        # 100 tokens left, 200 more take 20 seconds
+        async with limiter.request(300):
+            pass
+        assert clock.sleeps == pytest.approx([20])
+        # larger than the bucket: waits for a full bucket instead of forever
+        async with limiter.request(10000):
+            pass
+
+    asyncio.run(run())
+    assert clock.sleeps == pytest.approx([20, 60])
+    assert clock.now == pytest.approx(80)
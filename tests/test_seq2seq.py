@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+tokenizers = pytest.importorskip("tokenizers")
+
+from modules.translate.seq2seq import Seq2SeqTranslator
+
+WORDS = "one two three four five six seven eight nine ten . ! ?".split()
+MAX_LENGTH = 8
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    """A tiny randomly initialised BART model and word-level tokenizer, saved with save_pretrained."""
+    specials = ["<pad>", "<s>", "</s>", "<unk>"]
+    vocab = {token: i for i, token in enumerate(specials + WORDS)}
+    backend = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = tokenizers.pre_tokenizers.WhitespaceSplit()
+    backend.post_processor = tokenizers.processors.TemplateProcessing(
+        single="$A </s>", special_tokens=[("</s>", vocab["</s>"])])
+    tokenizer = transformers.PreTrainedTokenizerFast(
+        tokenizer_object=backend, pad_token="<pad>", bos_token="<s>", eos_token="</s>",
+        unk_token="<unk>", model_max_length=MAX_LENGTH)
+
+    torch.manual_seed(0)
+    config = transformers.BartConfig(
+        vocab_size=len(vocab), d_model=16, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32,
+        max_position_embeddings=64, pad_token_id=0, bos_token_id=1, eos_token_id=2, decoder_start_token_id=2)
+    model = transformers.BartForConditionalGeneration(config)
+
+    path = tmp_path_factory.mktemp("tiny-bart")
+    tokenizer.save_pretrained(path)
+    model.save_pretrained(path)
+    return path
+
+
+@pytest.fixture
+def translator(model_dir):
+    translator = Seq2SeqTranslator()
+    translator.init({"models": {"English-German": str(model_dir)}, "num_beams": 2, "max_batch_size": 2})
+    return translator
+
+
+@pytest.fixture
+def generate_calls(translator):
+    """Records the inputs and settings of every generate call of the loaded model."""
+    _, model, _ = translator.load("English", "German")
+    generate = model.generate
+    calls = []
+
+    def spy(**kwargs):
+        calls.append(kwargs)
+        return generate(**kwargs)
+
+    model.generate = spy
+    return calls
+
+
+def test_texts_are_batched_by_length(translator, generate_calls):
+    texts = ["one", "one two three four", "five six", "seven eight nine"]
+    translated = translator.translate_texts(texts, "English", "German")
+
+    assert len(translated) == len(texts)
+    assert all(isinstance(text, str) and text for text in translated)
+    # longest first, at most max_batch_size texts per batch
+    assert [len(call["input_ids"]) for call in generate_calls] == [2, 2]
+    assert [call["input_ids"].shape[1] for call in generate_calls] == [5, 3]
+    for call in generate_calls:
+        assert call["num_beams"] == 2
+        assert call["use_cache"] is True
+    # the same text translates the same, alone or in a batch
+    assert translator.translate(texts[1], "English", "German") == translated[1]
+
+
+def test_long_texts_are_split_by_sentence(translator, generate_calls):
+    text = "one two three . four five six ! seven eight nine ten one two ?"
+    translator.translate(text, "English", "German")
+
+    # three sentences of 5, 5 and 8 tokens with </s>, none fits with another
+    # under the limit; the longest is batched with one of the others
+    assert [call["input_ids"].shape[1] for call in generate_calls] == [MAX_LENGTH, 5]
+    assert sum(len(call["input_ids"]) for call in generate_calls) == 3
+    assert translator.stats()["truncated_sentences"] == 0
+
+
+def test_overlong_sentences_are_truncated_and_counted(translator, generate_calls):
+    text = "one two three four five six seven eight nine ten"
+    translator.translate_texts([text, text], "English", "German")
+
+    assert [call["input_ids"].shape[1] for call in generate_calls] == [MAX_LENGTH]
+    assert translator.stats()["truncated_sentences"] == 2
+
+
+def test_batches_from_a_limiter(translator):
+    texts = ["one two", "three", "four five six"]
+    expected = translator.translate_texts(texts, "English", "German")
+    assert asyncio.run(translator.atranslate_batch(texts, "English", "German")) == expected
+
+
+def test_unknown_pair(translator):
+    with pytest.raises(ValueError):
+        translator.translate("one", "English", "French")
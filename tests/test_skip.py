@@ -0,0 +1,47 @@
+import pytest
+
+from modules.translate.skip import SkipClassifier
+
+
+@pytest.mark.parametrize("text, to_lang, reason", [
+    # page numbers, bullets and lone symbols
+    ("12", "German", "no_text"),
+    ("- 12 -", "German", "no_text"),
+    ("•", "German", "no_text"),
+    ("x", "German", "no_text"),
+    # numeric tables and formulas
+    ("12.5  13.1  14.2  15.0", "German", "no_text"),
+    ("Table 2  12.5  13.1  14.2  15.0  16.3", "German", "numeric"),
+    ("$x^2 + y^2 = z^2$", "German", "math"),
+    ("E = mc^2 + a_1 - b_2 * c", "German", "math"),
+    # addresses
+    ("https://example.com/data?id=3", "German", "url"),
+    ("www.example.org", "German", "url"),
+    ("doi:10.1000/xyz123", "German", "url"),
+    ("jane.doe@example.com", "German", "url"),
+    ("def f(x):\n    return x + 1\nif y:\n    pass", "German", "code"),
+    # already in the target language
+    ("Das ist die Einleitung und der Text der Arbeit", "German", "target_language"),
+    ("Привет мир", "Russian", "target_language"),
+    # real text is translated
+    ("Results and discussion", "German", None),
+    ("OK", "German", None),
+    ("The value is 42 percent of the total.", "German", None),
+    ("See https://example.com for the data used in this study.", "German", None),
+    ("Figure 3: results of the first experiment", "German", None),
+    ("Der Hund", "German", None),
+    ("Das ist die Einleitung und der Text der Arbeit", "French", None),
+    ("Привет мир", "German", None),
+])
+def test_skip_rules(text, to_lang, reason):
+    assert SkipClassifier().reason(text, "English", to_lang) == reason
+
+
+def test_check_counts_skipped_blocks():
+    skip = SkipClassifier()
+    texts = ["12", "https://example.com", "Results and discussion", "- 3 -"]
+    assert [skip.check(text, "English", "German") for text in texts] == [False, False, True, False]
+    stats = skip.stats()
+    assert stats["skip_checked"] == 4
+    assert stats["skip_calls_saved"] == 3
+    assert stats["skip_reasons"] == {"no_text": 2, "url": 1}
@@ -3,10 +3,11 @@ from .textwrap_local import fw_fill, fw_wrap
 from .ocr_model import OCRModel
 from .layout_model import LayoutAnalyzer
 from .gui import create_gradio_app
+from .pdf_pages import iter_pdf_pages
 
 import yaml
 
-__all__ = ["fw_fill", "fw_wrap", "OCRModel", "LayoutAnalyzer"]
+__all__ = ["fw_fill", "fw_wrap", "OCRModel", "LayoutAnalyzer", "iter_pdf_pages"]
 
 def load_config(base_config_path, override_config_path):
     with open(base_config_path, 'r') as base_file:
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+
+def make_key(*parts: Any) -> str:
+    """Hash the given parts into a cache key.
+
+    Bytes are hashed as they are, everything else as sorted JSON. Every
+    part is length-prefixed so different splits never collide.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class FileCache:
+    """Directory of files addressed by key, with a size cap and LRU eviction.
+
+    The modification time of a file doubles as its last access time, so
+    the LRU order survives restarts.
+
+    Parameters
+    ----------
+    cache_dir: Path
+        Directory holding the cached files
+    max_size_mb: float
+        Total size above which the least recently used files are removed
+    suffix: str
+        File name suffix of the cached files
+    """
+
+    def __init__(self, cache_dir: Path, max_size_mb: float = 1024, suffix: str = "") -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.suffix = suffix
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the path of a cached file, or None on a miss."""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, src: Path) -> Path:
+        """Copy a file into the cache."""
+        with open(src, "rb") as f:
+            return self.put_bytes(key, f.read())
+
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        """Store data in the cache."""
+        path = self.path(key)
+        # write to a temp file first so readers never see partial entries
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self._evict()
+        return path
+
+    def copy_to(self, key: str, dst: Path) -> bool:
+        """Copy a cached file to dst, return False on a miss."""
+        path = self.get(key)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, dst)
+        except FileNotFoundError:
+            # evicted in the meantime
+            return False
+        return True
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob(f"*{self.suffix}"):
+                if path.suffix == ".tmp":
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_size:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
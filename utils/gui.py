@@ -1,38 +1,70 @@
+import base64
+import io
+import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import gradio as gr
 import requests
+from PIL import Image
 
 TRANSLATE_URL = "http://localhost:8765/translate_pdf/"
+TRANSLATE_STREAM_URL = "http://localhost:8765/translate_pdf_stream/"
+JOBS_URL = "http://localhost:8765/jobs/"
 CLEAR_TEMP_URL = "http://localhost:8765/clear_temp_dir/"
 
 
-def translate_request(file: Any, from_lang: Any, to_lang: Any, from_page: int, to_page: int, both: bool) -> tuple[Path]:
+def iter_events(response: requests.Response) -> Iterator[tuple[str, dict]]:
+    """Parses a server-sent events response into (event, data) pairs."""
+    event, data = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].strip())
+        elif not line and data:
+            yield event, json.loads("\n".join(data))
+            event, data = "message", []
+
+
+def translate_request(file: Any, from_lang: Any, to_lang: Any, from_page: int, to_page: int, both: bool) -> Iterator[tuple[list, str]]:
     """Sends a POST request to the translator server to translate a PDF.
 
+    Translated pages are shown as soon as the server streams them, the
+    complete PDF is downloaded once the translation is done.
+
     Parameters
     ----------
     file : Any
         the PDF to be translated.
 
-    Returns
-    -------
-    tuple[Path, list[Image.Image]]
-        Path to the translated PDF and a list of images of the
-        translated PDF.
+    Yields
+    ------
+    tuple[list[Image.Image], str]
+        Images of the pages translated so far and the path to the
+        translated PDF (None until the translation is done).
     """
-    response = requests.post(TRANSLATE_URL, files={"input_pdf": open(file.name, "rb")}, data={
-        "from_lang": from_lang, "to_lang": to_lang, "p_from": from_page, "p_to": to_page, "side_by_side": both
-    })
-
-    if response.status_code == 200:
-        with open("temp/translated.pdf", "wb") as f:
-            f.write(response.content)
+    pages = []
+    with requests.post(TRANSLATE_STREAM_URL, files={"input_pdf": open(file.name, "rb")}, data={
+        "from_lang": from_lang, "to_lang": to_lang, "p_from": from_page, "p_to": to_page, "side_by_side": both,
+        "page_format": "png",
+    }, stream=True) as response:
+        if response.status_code != 200:
+            print(f"An error occurred: {response.status_code}")
+            return
 
-        return str("temp/translated.pdf")
-    else:
-        print(f"An error occurred: {response.status_code}")
+        for event, data in iter_events(response):
+            if event == "page":
+                pages.append(Image.open(io.BytesIO(base64.b64decode(data["data"]))))
+                yield pages, None
+            elif event == "done":
+                result = requests.get(f"{JOBS_URL}{data['job_id']}/result")
+                output_path = Path("temp") / f"translated_{data['job_id']}.pdf"
+                with open(output_path, "wb") as f:
+                    f.write(result.content)
+                yield pages, str(output_path)
+            elif event == "error":
+                print(f"An error occurred: {data['error']}")
 
 
 def create_gradio_app(langs):
@@ -49,12 +81,13 @@ def create_gradio_app(langs):
             both = gr.Checkbox(label='render side by side', value=True)
 
             btn = gr.Button(value="convert")
+            translated_pages = gr.Gallery(label="translated pages", columns=2)
             translated_file = gr.File(label="translated fie", file_types=[".pdf"])
 
             btn.click(
                 translate_request,
                 inputs=[file, from_lang, to_lang, from_page, to_page, both],
-                outputs=[translated_file],
+                outputs=[translated_pages, translated_file],
             )
 
         return demo
@@ -0,0 +1,130 @@
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Job:
+    """A single translation job.
+
+    Attributes
+    ----------
+    id: str
+        Job id handed out to the client
+    work_dir: Path
+        Directory holding everything the job writes
+    status: str
+        One of "queued", "running", "done" or "failed"
+    pages_total: int
+        Number of pages to translate, known once the job is running
+    pages_done: int
+        Number of pages already written to the output
+    error: Optional[str]
+        Error message of a failed job
+    peak_rss_mb: Optional[float]
+        Peak resident memory of the server observed when the job finished
+    translator_calls_saved: Optional[int]
+        Blocks that reused the translation of a repeated block of the document
+    translator_stats: Optional[dict]
+        Counters of the translation memory (lookups, hits, calls avoided)
+        when the job finished, accumulated over all jobs of the server
+    """
+
+    id: str
+    work_dir: Path
+    status: str = "queued"
+    pages_total: int = 0
+    pages_done: int = 0
+    error: Optional[str] = None
+    peak_rss_mb: Optional[float] = None
+    translator_calls_saved: Optional[int] = None
+    translator_stats: Optional[dict] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def result_path(self) -> Path:
+        return self.work_dir / "translated.pdf"
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "pages_total": self.pages_total,
+            "pages_done": self.pages_done,
+            "error": self.error,
+            "peak_rss_mb": self.peak_rss_mb,
+            "translator_calls_saved": self.translator_calls_saved,
+            "translator_stats": self.translator_stats,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobStore:
+    """Registry of translation jobs, each with its own working directory.
+
+    Parameters
+    ----------
+    root_dir: Path
+        Directory under which the job directories are created
+    ttl: float
+        Seconds a finished job and its files are kept, 0 keeps them until
+        they are removed
+    """
+
+    ACTIVE = ("queued", "running")
+
+    def __init__(self, root_dir: Path, ttl: float = 0) -> None:
+        self.root_dir = root_dir
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def create(self) -> Job:
+        self.expire()
+        job_id = uuid.uuid4().hex
+        work_dir = self.root_dir / job_id
+        work_dir.mkdir(parents=True)
+        job = Job(id=job_id, work_dir=work_dir)
+        with self._lock:
+            self._jobs[job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def remove(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None:
+            shutil.rmtree(job.work_dir, ignore_errors=True)
+        return job
+
+    def remove_finished(self, older_than: float = 0) -> List[str]:
+        """Remove the jobs that finished more than older_than seconds ago.
+
+        Queued and running jobs are never removed.
+        """
+        now = time.time()
+        with self._lock:
+            job_ids = [
+                job.id for job in self._jobs.values()
+                if job.status not in self.ACTIVE
+                and job.finished_at is not None
+                and now - job.finished_at >= older_than
+            ]
+        for job_id in job_ids:
+            self.remove(job_id)
+        return job_ids
+
+    def expire(self) -> List[str]:
+        """Remove the finished jobs older than ttl."""
+        if not self.ttl:
+            return []
+        return self.remove_finished(self.ttl)
@@ -0,0 +1,88 @@
+import gzip
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .cache import FileCache, make_key
+from .layout_model import Layout
+
+
+class LayoutCache:
+    """Persistent cache of layout detection and OCR results per page.
+
+    Entries are keyed by the page image and the layout/OCR config, so a
+    page translated into another language skips both vision models. Only
+    type, bbox, score, text and line_cnt are stored, as gzipped JSON; the
+    block images are cropped from the page again on a hit.
+
+    Parameters
+    ----------
+    cache_dir: Path
+        Directory holding the cache entries
+    max_size_mb: float
+        Total size above which the least recently used entries are removed
+    config: dict
+        Layout and OCR settings the results depend on
+    """
+
+    def __init__(self, cache_dir: Path, max_size_mb: float, config: dict) -> None:
+        self.files = FileCache(cache_dir, max_size_mb, suffix=".json.gz")
+        self.config = config
+
+    def key(self, image) -> str:
+        page = np.asarray(image)
+        return make_key(page.shape, str(page.dtype), page.tobytes(), self.config)
+
+    def get(self, key: str, image) -> Optional[List[Layout]]:
+        path = self.files.get(key)
+        if path is None:
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            # evicted or truncated in the meantime
+            return None
+
+        page = np.asarray(image)
+        layouts = []
+        for type_, bbox, score, text, line_cnt in entries:
+            layout = Layout(type=type_, bbox=np.array(bbox), score=score)
+            x1, y1, x2, y2 = bbox
+            layout.image = page[int(y1) : int(y2), int(x1) : int(x2)].copy()
+            layout.text = text
+            layout.line_cnt = line_cnt
+            layouts.append(layout)
+        return layouts
+
+    def put(self, key: str, layouts: List[Layout]) -> None:
+        entries = [
+            [
+                layout.type,
+                [int(v) for v in layout.bbox],
+                float(layout.score),
+                layout.text,
+                layout.line_cnt,
+            ]
+            for layout in layouts
+        ]
+        data = gzip.compress(json.dumps(entries).encode("utf-8"))
+        self.files.put_bytes(key, data)
+
+
+def load_layout_cache(cfg: dict, force: bool = False) -> Optional[LayoutCache]:
+    """Create the layout cache configured in `cache.layout`.
+
+    Returns None if the cache is disabled, unless force is set.
+    """
+    layout_cfg = cfg.get('cache', {}).get('layout', {})
+    if not (layout_cfg.get('enabled', False) or force):
+        return None
+    return LayoutCache(
+        Path(layout_cfg.get('dir', 'temp/cache/layout')),
+        layout_cfg.get('max_size_mb', 512),
+        # onnxruntime settings (threads, profiling) do not change the results
+        {'layout': cfg['layout'], 'ocr': {k: v for k, v in cfg['ocr'].items() if k != 'onnxruntime'}},
+    )
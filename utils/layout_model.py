@@ -89,7 +89,8 @@ class LayoutAnalyzer:
 
     def _get_image(self, image: np.ndarray, bbox: tuple[float, ...]) -> np.ndarray:
         x1, y1, x2, y2 = bbox
-        return image[int(y1) : int(y2), int(x1) : int(x2)]
+        # copy, so the crops do not keep the whole page array alive
+        return image[int(y1) : int(y2), int(x1) : int(x2)].copy()
 
     @property
     def _id_to_class_names(self) -> dict[int, str]:
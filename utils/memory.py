@@ -0,0 +1,90 @@
+import resource
+import sys
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class PageBudget:
+    """Hard cap on the number of pages held in memory at once.
+
+    A page slot is taken before the next page is pulled from the source
+    (i.e. before it is rasterized) and must be given back with release()
+    once the page has been written and dropped. close() ends a budget
+    early, e.g. when a page fails, and unblocks a source waiting for a slot.
+
+    Parameters
+    ----------
+    max_pages: int
+        Maximum number of resident pages, 0 disables the cap
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, max_pages: int = 0) -> None:
+        self.max_pages = max_pages
+        self._slots = threading.BoundedSemaphore(max_pages) if max_pages > 0 else None
+        self._held = 0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def limit(self, items: Iterable[T]) -> Iterator[T]:
+        """Yield from items, waiting for a free slot before each one.
+
+        Ends without pulling further items once the budget is closed.
+        """
+        items = iter(items)
+        try:
+            while self.acquire():
+                try:
+                    item = next(items)
+                except StopIteration:
+                    self.release()
+                    return
+                yield item
+        finally:
+            # lets a page source clean up (e.g. its temp dir) right away
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    def acquire(self) -> bool:
+        """Take a slot, return False if the budget is closed while waiting."""
+        if self._slots is None:
+            return not self._closed.is_set()
+        while not self._closed.is_set():
+            if self._slots.acquire(timeout=self.POLL_INTERVAL):
+                with self._lock:
+                    self._held += 1
+                return True
+        return False
+
+    def release(self) -> None:
+        if self._slots is None:
+            return
+        with self._lock:
+            if self._held == 0:
+                # already given back by close()
+                return
+            self._held -= 1
+        self._slots.release()
+
+    def close(self) -> None:
+        """Stop handing out slots and give back the ones still held."""
+        self._closed.set()
+        if self._slots is None:
+            return
+        with self._lock:
+            held, self._held = self._held, 0
+        for _ in range(held):
+            self._slots.release()
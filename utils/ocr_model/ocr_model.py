@@ -3,6 +3,7 @@ from pathlib import Path
 import numpy as np
 
 from .ppocr_onnx.ppocr_onnx import PaddleOcrONNX
+from .ppocr_onnx.tools.infer.utility import group_lines
 
 
 class _DictDotNotation(dict):
@@ -12,7 +13,15 @@ class _DictDotNotation(dict):
 
 
 class OCRModel:
-    def __init__(self, model_root_dir: Path, device: str = "cuda") -> None:
+    def __init__(
+        self,
+        model_root_dir: Path,
+        device: str = "cuda",
+        page_det_limit_side_len: int = 2560,
+        rec_batch_num: int = 6,
+        rec_bucket_ratio: float = 0,
+        onnxruntime: dict = None,
+    ) -> None:
         """
         Initialize OCR model.
 
@@ -22,6 +31,18 @@ class OCRModel:
             Path to the PaddleOCR model root directory.
         device : str, optional
             Device to use, by default "cuda"
+        page_det_limit_side_len : int, optional
+            Longest side whole pages are resized to for text detection,
+            by default 2560
+        rec_batch_num : int, optional
+            Maximum number of line crops recognized in one batch, by default 6
+        rec_bucket_ratio : float, optional
+            A recognition batch ends where the crop width grows by more than
+            this factor, 0 disables it, by default 0
+        onnxruntime : dict, optional
+            ONNX Runtime session settings of the det/rec/cls models (threads,
+            execution mode, graph optimization, optimized model cache,
+            profiling), by default the ONNX Runtime defaults
 
         Raises
         ------
@@ -31,6 +52,10 @@ class OCRModel:
         self.paddleocr_parameters = self.__get_paddleocr_parameters(
             model_root_dir, device
         )
+        self.paddleocr_parameters.page_det_limit_side_len = page_det_limit_side_len
+        self.paddleocr_parameters.rec_batch_num = rec_batch_num
+        self.paddleocr_parameters.rec_bucket_ratio = rec_bucket_ratio
+        self.paddleocr_parameters.onnxruntime = onnxruntime or {}
         self.paddleocr = PaddleOcrONNX(self.paddleocr_parameters)
 
     def __call__(self, image: np.ndarray) -> str:
@@ -49,6 +74,106 @@ class OCRModel:
         """
         return self.paddleocr(image)
 
+    def detect(self, image: np.ndarray) -> tuple:
+        """
+        Detect the text lines of a block image.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            Block image
+
+        Returns
+        -------
+        tuple
+            Line boxes with shape [4, 2], top to bottom, left to right,
+            and the index of the text line every box belongs to
+        """
+        return self.paddleocr.detect(image)
+
+    def detect_page(self, image: np.ndarray) -> tuple:
+        """
+        Detect the text lines of a whole page.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            Page image, in the channel order of the block images
+
+        Returns
+        -------
+        tuple
+            Line boxes with shape [4, 2], top to bottom, left to right,
+            and the index of the text line every box belongs to
+        """
+        return self.paddleocr.detect_page(image)
+
+    def group_lines(self, boxes: list) -> tuple:
+        """
+        Group line boxes into text lines.
+
+        Parameters
+        ----------
+        boxes : list
+            Line boxes with shape [4, 2]
+
+        Returns
+        -------
+        tuple
+            Box indices in reading order, and the index of the text line
+            of every box in that order
+        """
+        return group_lines(boxes)
+
+    def recognize(self, image: np.ndarray, boxes: list) -> list:
+        """
+        Recognize the text in the given line boxes of an image.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            Image the boxes were detected in
+        boxes : list
+            Line boxes with shape [4, 2]
+
+        Returns
+        -------
+        list
+            (text, score) for every box, compare the score to drop_score
+        """
+        return self.paddleocr.recognize(image, boxes)
+
+    def recognize_many(self, items: list) -> list:
+        """
+        Recognize the lines of several images in shared batches.
+
+        Parameters
+        ----------
+        items : list
+            (image, boxes) pairs
+
+        Returns
+        -------
+        list
+            For every pair, (text, score) for every box
+        """
+        crops, counts = [], []
+        for image, boxes in items:
+            image_crops = self.paddleocr.crop(image, boxes)
+            crops.extend(image_crops)
+            counts.append(len(image_crops))
+
+        rec_res = self.paddleocr.recognize_crops(crops)
+        results, start = [], 0
+        for count in counts:
+            results.append(rec_res[start : start + count])
+            start += count
+        return results
+
+    @property
+    def drop_score(self) -> float:
+        return self.paddleocr.drop_score
+
     def __get_paddleocr_parameters(
         self, model_root_dir: Path, device: str
     ) -> _DictDotNotation:
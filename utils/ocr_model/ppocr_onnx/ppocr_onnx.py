@@ -6,7 +6,8 @@ import cv2
 
 from .tools.infer import predict_cls, predict_det
 from .tools.infer import predict_rec as predict_rec
-from .tools.infer.utility import get_minarea_rect_crop, get_rotate_crop_image
+from .ppocr.data.imaug.operators import DetResizeForTest
+from .tools.infer.utility import get_minarea_rect_crop, get_rotate_crop_image, sort_lines
 
 
 class PaddleOcrONNX(object):
@@ -24,6 +25,14 @@ class PaddleOcrONNX(object):
         self.args = args
         self.crop_image_res_index = 0
 
+        # whole pages are detected at a higher resolution than single blocks,
+        # the network sees them downscaled to page_det_limit_side_len
+        self.page_preprocess_op = list(self.text_detector.preprocess_op)
+        self.page_preprocess_op[0] = DetResizeForTest(
+            limit_side_len=args.page_det_limit_side_len,
+            limit_type=args.det_limit_type,
+        )
+
     def draw_crop_rec_res(self, output_dir, img_crop_list, rec_res):
         os.makedirs(output_dir, exist_ok=True)
         bbox_num = len(img_crop_list)
@@ -39,16 +48,61 @@ class PaddleOcrONNX(object):
     def __call__(self, img, cls=True):
         time_dict = {"det": 0, "rec": 0, "csl": 0, "all": 0}
         start = time.time()
-        ori_im = img.copy()
         dt_boxes, elapse = self.text_detector(img)
         time_dict["det"] = elapse
 
         if dt_boxes is None:
             return None, None
-        img_crop_list = []
 
         dt_boxes = self.sorted_boxes(dt_boxes)
+        rec_res = self.recognize(img, dt_boxes, cls, time_dict)
+        filter_boxes, filter_rec_res = [], []
+        for box, rec_result in zip(dt_boxes, rec_res):
+            text, score = rec_result
+            if score >= self.drop_score:
+                filter_boxes.append(box)
+                filter_rec_res.append(rec_result)
+        end = time.time()
+        time_dict["all"] = end - start
+        return filter_boxes, filter_rec_res, time_dict
+
+    def detect(self, img):
+        """
+        Detect the text lines of a block image
+        return:
+            boxes sorted in reading order, each with shape [4, 2], and
+            the line index of every box
+        """
+        dt_boxes, _ = self.text_detector(img)
+        if dt_boxes is None:
+            return sort_lines([])
+        return sort_lines(dt_boxes)
 
+    def detect_page(self, img):
+        """
+        Detect the text lines of a whole page
+        args:
+            img(array): page image
+        return:
+            boxes sorted in reading order, each with shape [4, 2], and
+            the line index of every box
+        """
+        dt_boxes, _ = self.text_detector(img, self.page_preprocess_op)
+        if dt_boxes is None:
+            return sort_lines([])
+        return sort_lines(dt_boxes)
+
+    def recognize(self, img, dt_boxes, cls=True, time_dict=None):
+        """
+        Recognize the text in the given boxes of an image
+        return:
+            (text, score) for every box, including the ones below drop_score
+        """
+        return self.recognize_crops(self.crop(img, dt_boxes), cls, time_dict)
+
+    def crop(self, img, dt_boxes):
+        ori_im = img.copy()
+        img_crop_list = []
         for bno in range(len(dt_boxes)):
             tmp_box = copy.deepcopy(dt_boxes[bno])
             if self.args.det_box_type == "quad":
@@ -56,23 +110,26 @@ class PaddleOcrONNX(object):
             else:
                 img_crop = get_minarea_rect_crop(ori_im, tmp_box)
             img_crop_list.append(img_crop)
+        return img_crop_list
+
+    def recognize_crops(self, img_crop_list, cls=True, time_dict=None):
+        """
+        Recognize line crops, possibly from several images, in batches
+        of similar width
+        """
+        if len(img_crop_list) == 0:
+            return []
         if self.use_angle_cls and cls:
             img_crop_list, angle_list, elapse = self.text_classifier(img_crop_list)
-            time_dict["cls"] = elapse
+            if time_dict is not None:
+                time_dict["cls"] = elapse
 
         rec_res, elapse = self.text_recognizer(img_crop_list)
-        time_dict["rec"] = elapse
+        if time_dict is not None:
+            time_dict["rec"] = elapse
         if self.args.save_crop_res:
             self.draw_crop_rec_res(self.args.crop_res_save_dir, img_crop_list, rec_res)
-        filter_boxes, filter_rec_res = [], []
-        for box, rec_result in zip(dt_boxes, rec_res):
-            text, score = rec_result
-            if score >= self.drop_score:
-                filter_boxes.append(box)
-                filter_rec_res.append(rec_result)
-        end = time.time()
-        time_dict["all"] = end - start
-        return filter_boxes, filter_rec_res, time_dict
+        return rec_res
 
     def sorted_boxes(self, dt_boxes):
         """
@@ -82,18 +139,4 @@ class PaddleOcrONNX(object):
         return:
             sorted boxes(array) with shape [4, 2]
         """
-        num_boxes = dt_boxes.shape[0]
-        sorted_boxes = sorted(dt_boxes, key=lambda x: (x[0][1], x[0][0]))
-        _boxes = list(sorted_boxes)
-
-        for i in range(num_boxes - 1):
-            for j in range(i, -1, -1):
-                if abs(_boxes[j + 1][0][1] - _boxes[j][0][1]) < 10 and (
-                    _boxes[j + 1][0][0] < _boxes[j][0][0]
-                ):
-                    tmp = _boxes[j]
-                    _boxes[j] = _boxes[j + 1]
-                    _boxes[j + 1] = tmp
-                else:
-                    break
-        return _boxes
+        return sort_lines(dt_boxes)[0]
@@ -0,0 +1,118 @@
+import os
+import sys
+
+__dir__ = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(__dir__)
+sys.path.insert(0, os.path.abspath(os.path.join(__dir__, '../..')))
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from ppocr.postprocess.db_postprocess import DBPostProcess
+
+
+def synthetic_page(height, width, lines, columns, max_angle, rng):
+    """
+    Probability map of a page set in columns: slightly rotated bars of
+    high probability, one per text line, on a noisy background, like a
+    DB head outputs
+    """
+    pred = rng.uniform(0, 0.2, (height, width)).astype(np.float32)
+    rows = -(-lines // columns)
+    pitch = height / rows
+    column_width = width / columns
+    for line in range(lines):
+        column, row = divmod(line, rows)
+        w = rng.uniform(0.3, 0.9) * column_width
+        h = rng.uniform(0.4, 0.6) * pitch
+        cx = column * column_width + 0.05 * column_width + w / 2
+        cy = (row + 0.5) * pitch
+        box = cv2.boxPoints(((cx, cy), (w, h), rng.uniform(-max_angle, max_angle)))
+        cv2.fillPoly(pred, [np.round(box).astype(np.int32)], float(rng.uniform(0.6, 1.0)))
+    return pred
+
+
+def match(boxes, ref_boxes, tolerance):
+    """
+    Pairs every reference box with the closest box by largest corner
+    difference, returns the number of pairs within tolerance and the
+    largest corner difference among them
+    """
+    if len(boxes) == 0 or len(ref_boxes) == 0:
+        return 0, 0
+    boxes = np.asarray(boxes, dtype=np.float32)
+    ref_boxes = np.asarray(ref_boxes, dtype=np.float32)
+    diff = np.abs(ref_boxes[:, None] - boxes[None]).max(axis=3).max(axis=2)
+    closest = diff.min(axis=1)
+    matched = closest <= tolerance
+    return int(matched.sum()), float(closest[matched].max()) if matched.any() else 0
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.time()
+        out = fn()
+        best = min(best, time.time() - start)
+    return out, best
+
+
+def main(args):
+    rng = np.random.default_rng(args.seed)
+    postprocess = DBPostProcess(
+        thresh=args.det_db_thresh,
+        box_thresh=args.det_db_box_thresh,
+        max_candidates=args.max_candidates,
+        unclip_ratio=args.det_db_unclip_ratio,
+    )
+    height, width = args.size
+
+    total_loop, total_vec, total_ref, total_matched, max_diff = 0, 0, 0, 0, 0
+    for page in range(args.pages):
+        pred = synthetic_page(height, width, args.lines, args.columns, args.max_angle, rng)
+        mask = pred > postprocess.thresh
+        dest_h, dest_w = height * args.scale, width * args.scale
+
+        (ref_boxes, ref_scores), t_loop = timed(
+            lambda: postprocess.boxes_from_bitmap(pred, mask, dest_w, dest_h), args.repeat)
+        (boxes, scores), t_vec = timed(
+            lambda: postprocess.boxes_from_bitmap_vectorized(pred, mask, dest_w, dest_h), args.repeat)
+
+        # differences are compared in probability map pixels
+        matched, diff = match(boxes / args.scale, ref_boxes / args.scale, args.tolerance)
+        total_loop += t_loop
+        total_vec += t_vec
+        total_ref += len(ref_boxes)
+        total_matched += matched
+        max_diff = max(max_diff, diff)
+        print("page %d: %d/%d boxes, %d matched (max corner diff %.1f px), loop %.2f ms, vectorized %.2f ms" % (
+            page, len(boxes), len(ref_boxes), matched, diff, t_loop * 1000, t_vec * 1000))
+
+    print("total: %d/%d boxes matched within %.1f px (max %.1f px)" % (
+        total_matched, total_ref, args.tolerance, max_diff))
+    print("loop %.2f ms/page, vectorized %.2f ms/page, speedup %.1fx" % (
+        total_loop / args.pages * 1000, total_vec / args.pages * 1000, total_loop / max(total_vec, 1e-9)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="compare DBPostProcess.boxes_from_bitmap with its vectorized version on synthetic pages")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--lines", type=int, default=100, help="text lines per page")
+    parser.add_argument("--columns", type=int, default=2)
+    parser.add_argument("--size", type=int, nargs=2, default=[1280, 960], metavar=("HEIGHT", "WIDTH"),
+                        help="probability map size")
+    parser.add_argument("--scale", type=int, default=2, help="source image size / map size")
+    parser.add_argument("--max_angle", type=float, default=1.0, help="line rotation in degrees")
+    parser.add_argument("--det_db_thresh", type=float, default=0.3)
+    parser.add_argument("--det_db_box_thresh", type=float, default=0.6)
+    parser.add_argument("--det_db_unclip_ratio", type=float, default=1.5)
+    parser.add_argument("--max_candidates", type=int, default=1000)
+    parser.add_argument("--tolerance", type=float, default=2.0, help="max corner difference in probability map pixels")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page, the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    main(args)
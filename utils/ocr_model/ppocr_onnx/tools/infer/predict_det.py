@@ -207,7 +207,7 @@ class TextDetector(object):
         dt_boxes = np.array(dt_boxes_new)
         return dt_boxes
 
-    def __call__(self, img):
+    def __call__(self, img, preprocess_op=None):
         ori_im = img.copy()
         data = {'image': img}
 
@@ -216,7 +216,7 @@ class TextDetector(object):
         if self.args.benchmark:
             self.autolog.times.start()
 
-        data = transform(data, self.preprocess_op)
+        data = transform(data, preprocess_op or self.preprocess_op)
         img, shape_list = data
         if img is None:
             return None, 0
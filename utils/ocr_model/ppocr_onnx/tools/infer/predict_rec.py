@@ -40,6 +40,8 @@ class TextRecognizer(object):
             int(v) for v in args.rec_image_shape.split(",")
         ]
         self.rec_batch_num = args.rec_batch_num
+        # a batch is closed once its widest crop is this much wider than its narrowest
+        self.rec_bucket_ratio = getattr(args, 'rec_bucket_ratio', 0)
         self.rec_algorithm = args.rec_algorithm
         postprocess_params = {
             'name': 'CTCLabelDecode',
@@ -381,6 +383,28 @@ class TextRecognizer(object):
 
         return img
 
+    def batch_ranges(self, sorted_ratios, batch_num):
+        """
+        Split crops sorted by aspect ratio into (begin, end) batches.
+        Every crop of a batch is padded to its widest one, so with
+        rec_bucket_ratio a batch also ends where the width grows by more
+        than that factor; crops narrower than the model input width are
+        padded to it anyway.
+        """
+        imgC, imgH, imgW = self.rec_image_shape[:3]
+        min_ratio = imgW / imgH
+        ranges = []
+        beg = 0
+        for end in range(1, len(sorted_ratios) + 1):
+            full = end - beg == batch_num
+            if not full and self.rec_bucket_ratio and end < len(sorted_ratios):
+                narrowest = max(min_ratio, sorted_ratios[beg])
+                full = max(min_ratio, sorted_ratios[end]) > narrowest * self.rec_bucket_ratio
+            if full or end == len(sorted_ratios):
+                ranges.append((beg, end))
+                beg = end
+        return ranges
+
     def __call__(self, img_list):
         img_num = len(img_list)
         # Calculate the aspect ratio of all text bars
@@ -394,8 +418,8 @@ class TextRecognizer(object):
         st = time.time()
         if self.benchmark:
             self.autolog.times.start()
-        for beg_img_no in range(0, img_num, batch_num):
-            end_img_no = min(img_num, beg_img_no + batch_num)
+        for beg_img_no, end_img_no in self.batch_ranges(
+                np.array(width_list)[indices], batch_num):
             norm_img_batch = []
             if self.rec_algorithm == "SRN":
                 encoder_word_pos_list = []
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import argparse
+import atexit
 import os
 import sys
 import platform
@@ -184,13 +185,87 @@ def create_predictor(args, mode, logger):
         providers = ['CPUExecutionProvider']
         if args.use_gpu:
             providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
+        sess_options, model_file_path, optimized_path = create_session_options(
+            getattr(args, 'onnxruntime', None) or {}, mode, model_file_path, logger)
         sess = ort.InferenceSession(
             model_file_path,
+            sess_options=sess_options,
             providers=providers,
         )
+        if optimized_path is not None:
+            # worker processes may save the same graph at once, each writes
+            # its own file and only complete files get the final name
+            os.replace(sess_options.optimized_model_filepath, optimized_path)
+        if sess_options.enable_profiling:
+            # the per-op timings are written when profiling ends
+            atexit.register(end_profiling, sess, mode, logger)
         return sess, sess.get_inputs()[0], None, None
 
 
+def create_session_options(ort_cfg, mode, model_file_path, logger):
+    """
+    Build ONNX Runtime SessionOptions from the `ocr.onnxruntime` config.
+    return:
+        the options, the model file to load, which is the serialized
+        optimized graph once it exists, and the path the optimized graph
+        is to be moved to after the session is created (None if it is not saved)
+    """
+    import onnxruntime as ort
+
+    levels = {
+        'disable': ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        'basic': ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        'extended': ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        'all': ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }
+    modes = {
+        'sequential': ort.ExecutionMode.ORT_SEQUENTIAL,
+        'parallel': ort.ExecutionMode.ORT_PARALLEL,
+    }
+
+    sess_options = ort.SessionOptions()
+    if ort_cfg.get('intra_op_num_threads', 0):
+        sess_options.intra_op_num_threads = ort_cfg['intra_op_num_threads']
+    if ort_cfg.get('inter_op_num_threads', 0):
+        sess_options.inter_op_num_threads = ort_cfg['inter_op_num_threads']
+    sess_options.execution_mode = modes[ort_cfg.get('execution_mode', 'sequential')]
+    level = ort_cfg.get('graph_optimization_level', 'all')
+    sess_options.graph_optimization_level = levels[level]
+
+    optimized_path = None
+    optimized_model_dir = ort_cfg.get('optimized_model_dir')
+    if optimized_model_dir and level != 'disable':
+        os.makedirs(optimized_model_dir, exist_ok=True)
+        # a replaced model file gets a new optimized graph
+        name = os.path.splitext(os.path.basename(model_file_path))[0]
+        saved_path = os.path.join(optimized_model_dir, "{}.{}.{}.onnx".format(
+            name, level, int(os.path.getmtime(model_file_path))))
+        if os.path.exists(saved_path):
+            # already optimized, skip the graph transformations on load
+            sess_options.graph_optimization_level = levels['disable']
+            model_file_path = saved_path
+        else:
+            optimized_path = saved_path
+            sess_options.optimized_model_filepath = "{}.{}.tmp.onnx".format(
+                saved_path[:-len(".onnx")], os.getpid())
+            logger.info("saving optimized {} model to {}".format(mode, optimized_path))
+
+    if ort_cfg.get('profile', False):
+        profile_dir = ort_cfg.get('profile_dir', 'temp/profile')
+        os.makedirs(profile_dir, exist_ok=True)
+        sess_options.enable_profiling = True
+        sess_options.profile_file_prefix = os.path.join(
+            profile_dir, "ort_{}_{}".format(mode, os.getpid()))
+
+    return sess_options, model_file_path, optimized_path
+
+
+def end_profiling(sess, mode, logger):
+    profile_file = sess.end_profiling()
+    logger.info("{} model profile written to {}".format(mode, profile_file))
+    return profile_file
+
+
 def get_output_tensors(args, mode, predictor):
     output_names = predictor.get_output_names()
     output_tensors = []
@@ -550,6 +625,47 @@ def get_minarea_rect_crop(img, points):
     return crop_img
 
 
+def group_lines(dt_boxes):
+    """
+    Group text boxes into lines, order the lines from top to bottom and the
+    boxes of a line from left to right
+    A box continues the line above it when it overlaps the line vertically
+    by at least half its height, i.e. its center is above the line's bottom.
+    args:
+        dt_boxes(array): detected text boxes with shape [N, 4, 2]
+    return:
+        box indices in reading order(array), line index of every box in that order(array)
+    """
+    if len(dt_boxes) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    boxes = np.asarray(dt_boxes, dtype=np.float32)
+    top, bottom = boxes[:, :, 1].min(axis=1), boxes[:, :, 1].max(axis=1)
+    center = (top + bottom) / 2
+
+    # boxes by center; a line ends where the next center is below every bottom so far
+    order = np.argsort(center, kind="stable")
+    reach = np.maximum.accumulate(bottom[order])
+    new_line = np.ones(len(order), dtype=bool)
+    new_line[1:] = center[order[1:]] > reach[:-1]
+    line_ids = np.empty(len(order), dtype=np.int64)
+    line_ids[order] = np.cumsum(new_line) - 1
+
+    order = np.lexsort((boxes[:, :, 0].min(axis=1), line_ids))
+    return order, line_ids[order]
+
+
+def sort_lines(dt_boxes):
+    """
+    Sort text boxes line by line, see group_lines
+    args:
+        dt_boxes(array): detected text boxes with shape [N, 4, 2]
+    return:
+        sorted boxes(list) with shape [4, 2], line index of every sorted box(array)
+    """
+    order, line_ids = group_lines(dt_boxes)
+    return [dt_boxes[i] for i in order], line_ids
+
+
 def check_gpu(use_gpu):
     if use_gpu:
         use_gpu = False
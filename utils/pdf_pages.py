@@ -0,0 +1,63 @@
+import tempfile
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+from pdf2image import convert_from_path, pdfinfo_from_bytes, pdfinfo_from_path
+from PIL import Image
+
+
+def get_page_count(pdf_path_or_bytes: Union[Path, bytes]) -> int:
+    """Return the number of pages of a PDF file without rasterizing it."""
+    if isinstance(pdf_path_or_bytes, bytes):
+        return int(pdfinfo_from_bytes(pdf_path_or_bytes)["Pages"])
+    return int(pdfinfo_from_path(str(pdf_path_or_bytes))["Pages"])
+
+
+def page_range(page_count: int, p_from: int = 0, p_to: int = 0) -> range:
+    """Return the 0-based page indices selected by p_from/p_to.
+
+    Both bounds are inclusive, p_to == 0 means "until the last page".
+    """
+    last = page_count - 1 if p_to == 0 else min(p_to, page_count - 1)
+    return range(max(p_from, 0), last + 1)
+
+
+def iter_pdf_pages(
+    pdf_path_or_bytes: Union[Path, bytes], dpi: int = 200, p_from: int = 0, p_to: int = 0
+) -> Iterator[Tuple[int, Image.Image]]:
+    """Lazily rasterize the requested page range of a PDF.
+
+    Pages are converted one at a time as the generator is consumed, so
+    only the selected range is ever rasterized and at most one page is
+    held by this generator at any time.
+
+    Parameters
+    ----------
+    pdf_path_or_bytes: Union[Path, bytes]
+        Path to the input PDF file or bytes of the input PDF file
+    dpi: int
+        Rasterization resolution
+    p_from: int
+        First page to convert (0-based, inclusive)
+    p_to: int
+        Last page to convert (0-based, inclusive), 0 means the last page
+
+    Yields
+    ------
+    Tuple[int, Image.Image]
+        Page index and the page image
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if isinstance(pdf_path_or_bytes, Path):
+            pdf_path = pdf_path_or_bytes
+        else:
+            # write the bytes once instead of letting convert_from_bytes
+            # dump the whole document to disk again for every page
+            pdf_path = Path(temp_dir) / "input.pdf"
+            pdf_path.write_bytes(pdf_path_or_bytes)
+
+        for i in page_range(get_page_count(pdf_path), p_from, p_to):
+            images = convert_from_path(
+                pdf_path, dpi=dpi, first_page=i + 1, last_page=i + 1
+            )
+            yield i, images[0]
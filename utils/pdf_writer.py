@@ -0,0 +1,179 @@
+import zlib
+from pathlib import Path
+from typing import BinaryIO, List, Union
+
+import numpy as np
+
+
+def concat_side_by_side(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Place two page images next to each other.
+
+    The shorter image is padded with white at the bottom so both pages
+    keep their original resolution.
+    """
+    left = _to_rgb(np.asarray(left))
+    right = _to_rgb(np.asarray(right))
+    height = max(left.shape[0], right.shape[0])
+    return np.concatenate([_pad_height(left, height), _pad_height(right, height)], axis=1)
+
+
+def _to_rgb(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return np.repeat(image[:, :, np.newaxis], 3, axis=2)
+    return image[:, :, :3]
+
+
+def _pad_height(image: np.ndarray, height: int) -> np.ndarray:
+    if image.shape[0] == height:
+        return image
+    pad = np.full(
+        (height - image.shape[0],) + image.shape[1:], 255, dtype=image.dtype
+    )
+    return np.concatenate([image, pad], axis=0)
+
+
+class PdfImageWriter:
+    """Minimal PDF writer that stores every page as a single image.
+
+    Page buffers are written as losslessly compressed image XObjects and
+    the page size is derived from the pixel size and the DPI, so the
+    output keeps the resolution of the source images.
+
+    Parameters
+    ----------
+    output: Union[Path, BinaryIO]
+        Output path, or a binary file object the writer does not own
+    dpi: int
+        Resolution of the page images
+    compress_level: int
+        zlib compression level of the image data
+    """
+
+    _CATALOG_ID = 1
+    _PAGES_ID = 2
+
+    def __init__(
+        self, output: Union[Path, BinaryIO], dpi: int = 200, compress_level: int = 6
+    ) -> None:
+        if isinstance(output, (str, Path)):
+            self.fp = open(output, "wb")
+            self._owns_fp = True
+        else:
+            self.fp = output
+            self._owns_fp = False
+        self.dpi = dpi
+        self.compress_level = compress_level
+
+        self._pos = 0
+        self._offsets = {}
+        self._next_id = self._PAGES_ID + 1
+        self._page_ids: List[int] = []
+        self._closed = False
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_object(
+            self._CATALOG_ID, b"<< /Type /Catalog /Pages %d 0 R >>" % self._PAGES_ID
+        )
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_ids)
+
+    def add_page(self, image: np.ndarray) -> None:
+        """Append one page showing the given image.
+
+        Parameters
+        ----------
+        image: np.ndarray
+            Grayscale (H, W) or RGB(A) (H, W, C) uint8 page buffer
+        """
+        img = np.asarray(image)
+        if img.dtype != np.uint8:
+            img = img.astype(np.uint8)
+        if img.ndim == 2:
+            colorspace = b"/DeviceGray"
+        else:
+            img = img[:, :, :3]
+            colorspace = b"/DeviceRGB"
+        img = np.ascontiguousarray(img)
+
+        height, width = img.shape[:2]
+        width_pt = width * 72.0 / self.dpi
+        height_pt = height * 72.0 / self.dpi
+
+        image_id = self._reserve_id()
+        content_id = self._reserve_id()
+        page_id = self._reserve_id()
+
+        self._write_stream(
+            image_id,
+            b"/Type /XObject /Subtype /Image /Width %d /Height %d "
+            b"/ColorSpace %s /BitsPerComponent 8 /Filter /FlateDecode"
+            % (width, height, colorspace),
+            zlib.compress(img.tobytes(), self.compress_level),
+        )
+        self._write_stream(
+            content_id,
+            b"",
+            b"q %.4f 0 0 %.4f 0 0 cm /Im0 Do Q" % (width_pt, height_pt),
+        )
+        self._write_object(
+            page_id,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.4f %.4f] "
+            b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+            % (self._PAGES_ID, width_pt, height_pt, image_id, content_id),
+        )
+        self._page_ids.append(page_id)
+
+    def close(self) -> None:
+        """Write the page tree, the cross-reference table and the trailer."""
+        if self._closed:
+            return
+        self._closed = True
+
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self._page_ids)
+        self._write_object(
+            self._PAGES_ID,
+            b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._page_ids)),
+        )
+
+        xref_pos = self._pos
+        size = self._next_id
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for obj_id in range(1, size):
+            self._write(b"%010d 00000 n \n" % self._offsets[obj_id])
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (size, self._CATALOG_ID, xref_pos)
+        )
+
+        self.fp.flush()
+        if self._owns_fp:
+            self.fp.close()
+
+    def __enter__(self) -> "PdfImageWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _reserve_id(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write(self, data: bytes) -> None:
+        self.fp.write(data)
+        self._pos += len(data)
+
+    def _write_object(self, obj_id: int, body: bytes) -> None:
+        self._offsets[obj_id] = self._pos
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (obj_id, body))
+
+    def _write_stream(self, obj_id: int, dictionary: bytes, data: bytes) -> None:
+        self._offsets[obj_id] = self._pos
+        self._write(
+            b"%d 0 obj\n<< %s /Length %d >>\nstream\n" % (obj_id, dictionary, len(data))
+        )
+        self._write(data)
+        self._write(b"\nendstream\nendobj\n")
@@ -0,0 +1,216 @@
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+
+@dataclass
+class Stage:
+    """One step of the page pipeline.
+
+    Attributes
+    ----------
+    name: str
+        Stage name, used for thread names and config lookup
+    fn: Callable
+        Function applied to every item passing through the stage
+    workers: int
+        Number of worker threads running this stage
+    """
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class PageTask:
+    """State of a single page as it travels through the pipeline."""
+
+    index: int
+    image: Any
+    result: Optional[list] = None
+    cache_key: Optional[str] = None
+    from_cache: bool = False
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+_DONE = object()
+
+
+class PagePipeline:
+    """Run items through a chain of stages with overlapping execution.
+
+    Every stage has its own worker threads and hands its output to the
+    next stage through a bounded queue, so while page N waits for the
+    translator, page N+1 can already be in layout detection or OCR.
+    Results are yielded in input order regardless of which page finished
+    first.
+
+    Parameters
+    ----------
+    stages: List[Stage]
+        Stages in execution order
+    queue_size: int
+        Maximum number of items waiting between two stages
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, stages: List[Stage], queue_size: int = 2) -> None:
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Process items and yield the results in input order.
+
+        The first exception raised by any stage is re-raised here and
+        the remaining work is abandoned.
+        """
+        queues = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+        stop = threading.Event()
+
+        threads = [
+            threading.Thread(
+                target=self._feed,
+                args=(items, queues[0], stop),
+                name="pipeline-feed",
+                daemon=True,
+            )
+        ]
+        for n, stage in enumerate(self.stages):
+            workers = max(1, stage.workers)
+            remaining = [workers]
+            lock = threading.Lock()
+            for w in range(workers):
+                threads.append(
+                    threading.Thread(
+                        target=self._work,
+                        args=(stage, queues[n], queues[n + 1], remaining, lock, stop),
+                        name=f"pipeline-{stage.name}-{w}",
+                        daemon=True,
+                    )
+                )
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            yield from self._collect(queues[-1])
+        finally:
+            stop.set()
+
+    def _put(self, q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue, stop: threading.Event) -> Any:
+        while not stop.is_set():
+            try:
+                return q.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, items: Iterable[Any], out_q: queue.Queue, stop: threading.Event) -> None:
+        seq = 0
+        items = iter(items)
+        try:
+            for item in items:
+                if not self._put(out_q, (seq, item), stop):
+                    return
+                seq += 1
+        except BaseException as e:
+            self._put(out_q, (seq, _Failure(e)), stop)
+        finally:
+            # a stopped pipeline closes its source now, not whenever it is collected
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+        self._put(out_q, _DONE, stop)
+
+    def _work(
+        self,
+        stage: Stage,
+        in_q: queue.Queue,
+        out_q: queue.Queue,
+        remaining: List[int],
+        lock: threading.Lock,
+        stop: threading.Event,
+    ) -> None:
+        while True:
+            task = self._get(in_q, stop)
+            if task is _DONE:
+                # let the sibling workers of this stage see the sentinel too
+                self._put(in_q, _DONE, stop)
+                break
+
+            seq, item = task
+            if not isinstance(item, _Failure):
+                try:
+                    item = stage.fn(item)
+                except BaseException as e:
+                    item = _Failure(e)
+            if not self._put(out_q, (seq, item), stop):
+                return
+
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            self._put(out_q, _DONE, stop)
+
+    def _collect(self, in_q: queue.Queue) -> Iterator[Any]:
+        pending = {}
+        next_seq = 0
+        while True:
+            task = in_q.get()
+            if task is _DONE:
+                break
+
+            seq, item = task
+            if isinstance(item, _Failure):
+                raise item.exc
+            pending[seq] = item
+            while next_seq in pending:
+                yield pending.pop(next_seq)
+                next_seq += 1
+
+
+def run_pages(
+    items: Iterable[Any], stages: List[Stage], mode: str = "sequential", queue_size: int = 2
+) -> Iterator[Any]:
+    """Run items through the stages in the configured execution mode.
+
+    Parameters
+    ----------
+    items: Iterable
+        Items to process
+    stages: List[Stage]
+        Stages in execution order
+    mode: str
+        'sequential' runs every stage inline, one item at a time.
+        'threaded' overlaps the stages with a PagePipeline.
+    queue_size: int
+        Maximum number of items waiting between two stages (threaded mode)
+    """
+    if mode == "sequential":
+        for item in items:
+            for stage in stages:
+                item = stage.fn(item)
+            yield item
+    elif mode == "threaded":
+        yield from PagePipeline(stages, queue_size).run(items)
+    else:
+        raise ValueError(f"unknown pipeline mode: {mode}")
@@ -0,0 +1,81 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .memory import peak_rss_mb
+
+# per-process engines, created once by _init_worker when the pool starts
+_layout_engine = None
+_ocr_engine = None
+
+
+def _init_worker(layout_cfg: dict, ocr_cfg: dict) -> None:
+    global _layout_engine, _ocr_engine
+    from modules import load_layout_engine, load_ocr_engine
+
+    _layout_engine = load_layout_engine(layout_cfg)
+    _ocr_engine = load_ocr_engine(ocr_cfg)
+
+
+def _ready() -> bool:
+    return _layout_engine is not None and _ocr_engine is not None
+
+
+def _recognize(image) -> tuple:
+    result = _layout_engine.get_single_layout(image)
+    result = _ocr_engine.get_all_text(result, image)
+    return result, os.getpid(), peak_rss_mb()
+
+
+class PageWorkerPool:
+    """Pool of processes running layout detection and OCR.
+
+    Every worker process loads its own layout and OCR engines once, when
+    the pool starts, so pages of a single document can be spread over
+    all CPU cores. Processes are started with the 'spawn' method because
+    the models are not fork-safe.
+
+    Parameters
+    ----------
+    layout_cfg: dict
+        `layout` section of the config
+    ocr_cfg: dict
+        `ocr` section of the config
+    processes: int
+        Number of worker processes
+    """
+
+    def __init__(self, layout_cfg: dict, ocr_cfg: dict, processes: int = 2) -> None:
+        self.processes = max(1, processes)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(layout_cfg, ocr_cfg),
+        )
+        # submitting one task per worker starts all processes, which makes
+        # them load their models now instead of on the first document
+        wait([self.executor.submit(_ready) for _ in range(self.processes)])
+
+        self._peak_rss = {}
+        self._lock = threading.Lock()
+
+    def recognize(self, image) -> list:
+        """Run layout detection and OCR for one page in a worker process.
+
+        Blocks until the result is available; call it from several
+        threads to keep all workers busy.
+        """
+        result, pid, peak = self.executor.submit(_recognize, image).result()
+        with self._lock:
+            self._peak_rss[pid] = max(peak, self._peak_rss.get(pid, 0))
+        return result
+
+    def peak_rss_mb(self) -> float:
+        """Sum of the peak resident memory reported by the worker processes."""
+        with self._lock:
+            return sum(self._peak_rss.values())
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)